@@ -1,40 +1,50 @@
+import itertools
+import json
 import random
+import numpy as np
 
 # The App class handles the content of the applications that can be displayed on the user interface.
 # It randomizes the information for each level of detail (lod) and provides a method to concatenate the first (lod + 1) entries from the info list.
-class App: 
-    def __init__(self, name, info):
-        self.name = name 
+# The concatenated texts of all LoDs are built once when the app is created, load_apps() creates all apps of an
+# apps-N.json file and draws their random values with NumPy in one step per entry type.
+class App:
+    __slots__ = ("name", "info", "lod_texts")
+
+    def __init__(self, name, info, texts=None, rng=random):
+        """
+        Args:
+            name (str): Name of the app.
+            info (list of dict): Info entries of the app as in apps-N.json.
+            texts (list of str): Optional text of each entry, e.g. from load_apps(); randomized from info if not given.
+            rng (random.Random): Random generator for the info, e.g. random.Random(seed); the random module by default.
+        """
+        self.name = name
 
         # Initialize info for each lod
-        lods = []
-        for entry in info: 
-            lods.append(self.init_info(entry))
+        if texts is None:
+            texts = [self.init_info(entry, rng) for entry in info]
 
-        self.info = lods
+        self.info = list(texts)
+        self.lod_texts = tuple(itertools.accumulate(self.info, lambda text, entry: text + "\n" + entry))
 
-    def init_info_time(self, start, end):
+    def init_info_time(self, start, end, rng=random):
         start_minutes = int(start[:len(start)-2]) * 60 + int(start[-2:])
         end_minutes = int(end[:len(end)-2]) * 60 + int(end[-2:])
-        
+
         # Generate random minutes within the range
-        random_minutes = random.randint(start_minutes, end_minutes)
-        
-        # Convert random minutes back to "hh:mm" format
-        random_hour = random_minutes // 60
-        random_minute = random_minutes % 60
-        
-        return f"{random_hour:02d}:{random_minute:02d}"
-
-    def init_info(self, entry):
+        random_minutes = rng.randint(start_minutes, end_minutes)
+
+        return format_time(random_minutes)
+
+    def init_info(self, entry, rng=random):
         entry_type = entry["type"]
         value = ""
         if entry_type == "int":
-            value = random.randint(entry["min"], entry["max"])
+            value = rng.randint(entry["min"], entry["max"])
         elif entry_type == "time":
             start = str(entry["min"]).zfill(4)
             end = str(entry["max"]).zfill(4)
-            value = self.init_info_time(start, end)
+            value = self.init_info_time(start, end, rng)
         return entry["label"] + " " + str(value)
 
     def get_lod(self, lod=0):
@@ -52,5 +62,65 @@ class App:
         """
         if not isinstance(lod, int) or lod < 0 or lod >= len(self.info):
             raise ValueError("lod invalid.")
-        
-        return "\n".join(self.info[:lod + 1])
\ No newline at end of file
+
+        return self.lod_texts[lod]
+
+
+def time_minutes(hhmm):
+    """Converts a time in the hhmm format of apps-N.json, e.g. 830 or "0830", to minutes."""
+    hhmm = str(hhmm).zfill(4)
+    return int(hhmm[:-2]) * 60 + int(hhmm[-2:])
+
+
+def format_time(minutes):
+    # Convert minutes back to "hh:mm" format
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def load_apps(path, rng=None):
+    """
+    Creates all apps of an apps-N.json file, see create_apps().
+
+    Returns:
+        dict[str, App]: Apps by name, in the order of the file.
+    """
+    with open(path, "r") as file:
+        return create_apps(json.load(file), rng)
+
+
+def create_apps(data, rng=None):
+    """
+    Creates all apps of the entries of an apps-N.json file.
+
+    The values of all "int" and "time" entries are drawn in one vectorized call each instead of one random.randint()
+    per entry.
+
+    Args:
+        data (list of dict): Apps with their "app" name and "info" entries.
+        rng (numpy.random.Generator): Random generator; by default seeded from the random module, so random.seed()
+            still reproduces the apps.
+
+    Returns:
+        dict[str, App]: Apps by name, in the order of data.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    entries = [entry for app in data for entry in app["info"]]
+    values = [""] * len(entries)
+    for entry_type, to_number, to_text in (("int", int, str), ("time", time_minutes, format_time)):
+        index = [i for i, entry in enumerate(entries) if entry["type"] == entry_type]
+        if not index:
+            continue
+        low = np.array([to_number(entries[i]["min"]) for i in index])
+        high = np.array([to_number(entries[i]["max"]) for i in index])
+        for i, value in zip(index, rng.integers(low, high, endpoint=True).tolist()):
+            values[i] = to_text(value)
+    texts = [entry["label"] + " " + value for entry, value in zip(entries, values)]
+
+    apps, start = {}, 0
+    for app in data:
+        end = start + len(app["info"])
+        apps[app["app"]] = App(app["app"], app["info"], texts[start:end])
+        start = end
+    return apps
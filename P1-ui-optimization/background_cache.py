@@ -0,0 +1,77 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+# On-disk cache of the background images resized to the window size. UI.init_background() would otherwise decode
+# the JPEG and LANCZOS-resize it on every launch. Entries are binary PPM files keyed by (path, size) and named after
+# the mtime of the image: tkinter loads PPM natively, so a cached background needs neither PIL nor image decoding.
+# When an image changes, the entries of its earlier mtimes are removed.
+#
+#   python background_cache.py scenes/scene-*.json   # warm the cache for all scenes
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "backgrounds")
+
+
+def background_key(path, size):
+    key = f"{os.path.abspath(path)}:{size[0]}x{size[1]}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def discard_background(cache_path):
+    """Removes a cache entry, e.g. one that cannot be read, so the next launch writes it again."""
+    try:
+        os.remove(cache_path)
+    except OSError:
+        pass
+
+
+def cached_background(path, size, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the path of the background image resized to size, resizing and storing it on a cache miss.
+
+    Args:
+        path (str): Path of the original background image.
+        size (tuple[int, int]): Target width and height in pixels.
+        cache_dir (str): Directory of the cached images.
+
+    Returns:
+        str: Path of the resized image in binary PPM format.
+    """
+    key = background_key(path, size)
+    cache_path = os.path.join(cache_dir, f"{key}-{os.stat(path).st_mtime_ns}.ppm")
+    if os.path.exists(cache_path):
+        return cache_path
+
+    from PIL import Image
+    os.makedirs(cache_dir, exist_ok=True)
+    # Entries of earlier versions of the image are never hit again
+    for stale_path in glob.glob(os.path.join(cache_dir, f"{key}-*.ppm")):
+        discard_background(stale_path)
+    img = Image.open(path).convert("RGB")
+    img = img.resize(size, Image.LANCZOS)
+    # Write to a temporary file first, so a concurrent launch never reads a partial image
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    img.save(tmp_path, format="PPM")
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def main():
+    from scene import Scene
+
+    parser = argparse.ArgumentParser(description="Precompute the resized background images of scenes.")
+    parser.add_argument("scenes", nargs="*", default=sorted(glob.glob("scenes/scene-*.json")))
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    for scene_path in args.scenes:
+        with open(scene_path, "r") as file:
+            env_path = json.load(file)["env_path"]
+        cache_path = cached_background(env_path, (Scene.WINDOW_WIDTH, Scene.WINDOW_HEIGHT), args.cache_dir)
+        print(f"{scene_path}: {env_path} -> {cache_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Headless batch runner: optimizes many scenes concurrently in a process pool and writes the placements to JSON/CSV
+# without opening a window. Each worker process keeps one Gurobi environment with its own thread limit.
+#
+#   python batch.py scenes/ --formulation two-stage --workers 8 --threads 1 --json layouts.json --csv layouts.csv
+
+FORMULATIONS = ["single-stage", "two-stage", "heuristic"]
+
+# Gurobi environment of the worker process, created by init_worker()
+worker_env = None
+
+
+def init_worker(threads, formulation):
+    # The heuristic needs no Gurobi environment, so heuristic batches run without gurobipy
+    global worker_env
+    if formulation != "heuristic":
+        import gurobipy as gp
+        worker_env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+
+
+def expand_scene_paths(patterns):
+    """
+    Expands directories and glob patterns into a sorted list of scene files, missing files are kept.
+
+    Directories are expanded to their scene-*.json files, so apps-*.json files next to them (e.g. in the output of
+    generate_scenes.py) are not taken for scenes.
+    """
+    scene_paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "scene-*.json")
+        matches = sorted(glob.glob(pattern))
+        if not matches and not glob.has_magic(pattern):
+            # Keep missing files, they are reported as failed scenes
+            matches = [pattern]
+        elif not matches:
+            print(f"No scene files match: {pattern}", file=sys.stderr)
+        scene_paths.extend(matches)
+    return list(dict.fromkeys(scene_paths))
+
+
+def optimize_scene(scene_path, formulation, seed, cache_dir=None):
+    """
+    Loads one scene and optimizes it, returns a JSON-serializable record with the placements.
+
+    With a cache_dir, scenes whose resolved inputs were optimized before are read from the result cache instead.
+    """
+    from scene import Scene
+
+    # The POI and questions panel positions are random when missing from the scene; scenes with their own seed
+    # (generate_scenes.py) are reproduced with it, the others are seeded per scene from --seed
+    scene = Scene(scene_path, default_seed=f"{seed}:{scene_path}")
+    app_ids = list(scene.apps.keys())
+    info = scene.get_info()
+
+    cache, cache_key, optimal_results = None, None, None
+    if cache_dir is not None:
+        from result_cache import ResultCache, scene_key
+        cache = ResultCache(cache_dir)
+        # The single-stage and heuristic objectives use the default interaction weights of objective.py
+        weights = {} if formulation == "two-stage" else {"lambda_weight": 0.1}
+        cache_key = scene_key(info, app_ids, scene.LODS, formulation, weights)
+        optimal_results = cache.get(cache_key)
+    cached = optimal_results is not None
+
+    start = time.perf_counter()
+    if formulation == "single-stage" and not cached:
+        from placement import solve_single_stage
+        optimal_results = solve_single_stage(info, app_ids, scene.LODS, env=worker_env)["optimal_results"]
+    elif formulation == "two-stage" and not cached:
+        from placement import solve_two_stage
+        optimal_results = solve_two_stage(info, app_ids, scene.LODS, env=worker_env)["optimal_results"]
+    elif formulation == "heuristic" and not cached:
+        from heuristic import heuristic_placement
+        optimal_results = heuristic_placement(info, app_ids, scene.LODS)
+    solve_time = time.perf_counter() - start
+    # Empty layouts are not stored, they are retried on the next run
+    if cache is not None and not cached and optimal_results:
+        cache.put(cache_key, optimal_results)
+
+    return {
+        "scene": scene_path,
+        "formulation": formulation,
+        "seed": seed,
+        "poi_pos": np.asarray(scene.poi_pos).tolist(),
+        "poi_size": np.asarray(scene.poi_size).tolist(),
+        "q_pos": [int(v) for v in scene.q_pos],
+        "solve_time": solve_time,
+        "cached": cached,
+        "optimal_results": optimal_results
+    }
+
+
+def write_json(records, path):
+    with open(path, mode="w") as file:
+        json.dump(records, file, indent=2)
+
+
+def write_csv(records, path):
+    with open(path, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Scene", "Formulation", "Seed", "App", "LoD", "Column", "Row"])
+        for record in records:
+            for result in record.get("optimal_results", []):
+                writer.writerow([record["scene"], record["formulation"], record["seed"],
+                                 result["name"], result["lod"], result["placement"][0], result["placement"][1]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize many scenes in parallel without opening a window.")
+    parser.add_argument("scenes", nargs="+", help="Scene files, directories (their scene-*.json files) or glob patterns.")
+    parser.add_argument("--formulation", choices=FORMULATIONS, default="single-stage")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes.")
+    parser.add_argument("--threads", type=int, default=1, help="Gurobi threads per worker.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random POI and questions panel positions.")
+    parser.add_argument("--json", default="batch_results.json", help="Output JSON file.")
+    parser.add_argument("--csv", help="Optional output CSV file with one row per placed app.")
+    parser.add_argument("--cache", action="store_true", help="Skip scenes whose inputs were optimized before.")
+    parser.add_argument("--cache-dir", default=None, help="Directory of the result cache, default: .cache/results.")
+    args = parser.parse_args()
+
+    scene_paths = expand_scene_paths(args.scenes)
+    if not scene_paths:
+        sys.exit(1)
+    cache_dir = None
+    if args.cache:
+        from result_cache import DEFAULT_CACHE_DIR
+        cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
+
+    records = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.threads, args.formulation)) as executor:
+        futures = {executor.submit(optimize_scene, scene_path, args.formulation, args.seed, cache_dir): scene_path
+                   for scene_path in scene_paths}
+        for future in as_completed(futures):
+            scene_path = futures[future]
+            try:
+                records[scene_path] = future.result()
+            except Exception as error:
+                records[scene_path] = {"scene": scene_path, "formulation": args.formulation, "seed": args.seed,
+                                       "error": f"{type(error).__name__}: {error}"}
+                print(f"Failed: {scene_path}: {error!r}", file=sys.stderr)
+            print(f"[{len(records)}/{len(scene_paths)}] {scene_path}", file=sys.stderr)
+
+    records = [records[scene_path] for scene_path in scene_paths]
+    write_json(records, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+    failed = sum("error" in record for record in records)
+    print(f"Optimized {len(records) - failed}/{len(records)} scenes in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Scaling benchmark of the optimizers: generates seeded scenes (generate_scenes.py) over a range of grid sizes and
+# app counts and solves each with the single-stage (main.py) and two-stage (multiStage.py) formulations without
+# opening a window. Every case runs in a fresh worker process, so its peak RSS is not inflated by earlier cases.
+# The report is a JSON file; --baseline compares the solve times with an earlier report.
+#
+#   python benchmark.py --grids 8x6 16x12 32x24 64x48 --apps 6 25 50 100 200 --output benchmark_report.json
+#   python benchmark.py --baseline old_report.json
+
+FORMULATIONS = ["single-stage", "two-stage"]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(scene_path, formulation, threads, time_limit):
+    """
+    Optimizes one scene and returns the measurements of the case.
+
+    Returns:
+        dict: Model build time, presolved model size, solve time, Stage-2 tryouts and peak RSS of the worker process.
+    """
+    import gurobipy as gp
+    from gurobipy import GRB
+    from scene import Scene
+    from objective import interaction_objective
+    from placement import solve_two_stage
+    from placement_model import PlacementModel
+
+    env = gp.Env(params={"OutputFlag": 0, "Threads": threads, "TimeLimit": time_limit})
+    load_start = time.perf_counter()
+    scene = Scene(scene_path)
+    app_ids = list(scene.apps.keys())
+    info = scene.get_info()
+    record = {"load_time": time.perf_counter() - load_start}
+
+    if formulation == "single-stage":
+        build_start = time.perf_counter()
+        coefficients = interaction_objective(info, app_ids, scene.LODS)
+        placement = PlacementModel(info, app_ids, scene.LODS, env=env)
+        placement.set_objective(coefficients, GRB.MAXIMIZE)
+        placement.model.update()
+        record["build_time"] = time.perf_counter() - build_start
+
+        # Presolve a copy of the model for its size, placement.optimize() presolves again
+        presolved = placement.model.presolve()
+        record.update(nonzeros=placement.model.NumNZs, presolve_variables=presolved.NumVars,
+                      presolve_constraints=presolved.NumConstrs, presolve_nonzeros=presolved.NumNZs)
+        presolved.dispose()
+
+        placement.optimize()
+        record.update(placement.statistics())
+        record["placed"] = len(placement.results())
+        placement.model.dispose()
+    else:
+        result = solve_two_stage(info, app_ids, scene.LODS, env=env)
+        stage2_report = result["stage2"]
+        record.update(total_time=result["total_time"], stage1_time=result["stage1_time"],
+                      build_time=result["build_time"],
+                      solve_time=sum(row["solve_time"] for row in stage2_report),
+                      nodes=sum(row["nodes"] for row in stage2_report),
+                      iterations=sum(row["iterations"] for row in stage2_report),
+                      status=result["status"], objective=result["objective"], gap=result["gap"],
+                      stage2_tryouts=len(stage2_report), placed=len(result["optimal_results"]))
+
+    env.dispose()
+    record["peak_rss_mb"] = peak_rss_mb()
+    return record
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Prints the solve time of every case next to the one of the baseline report."""
+    key = lambda case: (case["grid"], case["apps"], case["formulation"])
+    previous = {key(case): case for case in baseline["cases"] if "error" not in case}
+    print(f"\nBaseline: {baseline.get('revision')} ({baseline.get('created')})")
+    print(f"{'grid':>7} {'apps':>5} {'formulation':>13} {'solve (s)':>10} {'baseline':>10} {'ratio':>6}")
+    for case in report["cases"]:
+        if "error" in case or key(case) not in previous:
+            continue
+        before = previous[key(case)]["solve_time"]
+        ratio = case["solve_time"] / before if before > 0 else float("nan")
+        print(f"{case['grid']:>7} {case['apps']:>5} {case['formulation']:>13} {case['solve_time']:>10.4f} "
+              f"{before:>10.4f} {ratio:>6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the optimizers over grid sizes and app counts.")
+    parser.add_argument("--grids", nargs="+", default=["8x6", "16x12", "32x24", "64x48"], help="Grid sizes.")
+    parser.add_argument("--apps", type=int, nargs="+", default=[6, 25, 50, 100, 200], help="Numbers of apps.")
+    parser.add_argument("--formulations", nargs="+", choices=FORMULATIONS, default=FORMULATIONS)
+    parser.add_argument("--repeats", type=int, default=1, help="Scenes per grid size and app count.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Parallel cases; 1 gives the most stable timings.")
+    parser.add_argument("--threads", type=int, default=1, help="Gurobi threads per case.")
+    parser.add_argument("--time-limit", type=float, default=600, help="Gurobi time limit per solve in seconds.")
+    parser.add_argument("--scene-dir", help="Directory for the generated scenes, default: a temporary directory.")
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="Earlier report to compare the solve times with.")
+    args = parser.parse_args()
+
+    from generate_scenes import generate_scene, load_catalogue, parse_grid
+    import gurobipy as gp
+
+    scene_dir = args.scene_dir or tempfile.mkdtemp(prefix="ui_benchmark_")
+    os.makedirs(scene_dir, exist_ok=True)
+    catalogue = load_catalogue()
+    backgrounds = [os.path.join("scenes", "backgrounds", "nsh.jpg")]
+    cases = []
+    for grid, num_apps, repeat in itertools.product(args.grids, args.apps, range(args.repeats)):
+        columns, rows = parse_grid(grid)
+        name = f"{columns}x{rows}-a{num_apps}-{repeat}"
+        scene_path = generate_scene(scene_dir, name, f"{args.seed}:{name}", catalogue, backgrounds, columns, rows,
+                                    num_apps, num_questions=5 * num_apps)
+        cases.extend({"grid": f"{columns}x{rows}", "apps": num_apps, "repeat": repeat, "formulation": formulation,
+                      "scene": scene_path} for formulation in args.formulations)
+
+    # A fresh process per case (max_tasks_per_child), so ru_maxrss is the peak of that case only
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, max_tasks_per_child=1) as executor:
+        futures = {executor.submit(run_case, case["scene"], case["formulation"], args.threads, args.time_limit): case
+                   for case in cases}
+        for i, future in enumerate(as_completed(futures)):
+            case = futures[future]
+            try:
+                case.update(future.result())
+                summary = f"build {case['build_time']:.3f}s, solve {case['solve_time']:.3f}s, {case['peak_rss_mb']:.0f} MB"
+            except Exception as error:
+                case["error"] = repr(error)
+                summary = f"failed: {error!r}"
+            print(f"[{i + 1}/{len(cases)}] {case['grid']} {case['apps']} apps {case['formulation']}: {summary}",
+                  file=sys.stderr)
+
+    report = {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "gurobi": ".".join(str(v) for v in gp.gurobi.version()),
+        "platform": platform.platform(),
+        "threads": args.threads,
+        "time_limit": args.time_limit,
+        "total_time": time.perf_counter() - start,
+        "cases": cases
+    }
+    with open(args.output, mode="w") as file:
+        json.dump(report, file, indent=2)
+    failed = sum("error" in case for case in cases)
+    print(f"Ran {len(cases) - failed}/{len(cases)} cases in {report['total_time']:.1f}s: {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import glob
+import os
+import random
+import tempfile
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from scene import Scene
+from objective import weighted_objective
+from placement_model import PlacementModel
+
+# Compares the single-stage ILP of main.py with and without the optional cuts of PlacementModel.strengthen():
+# the aggregated capacity cut and the ordering constraints among apps with equal objective coefficients. Reports
+# branch-and-bound nodes, simplex iterations and solve time per variant and checks that the optimum is unchanged.
+# Besides the shipped scenes, --generated adds seeded 8 x 6 scenes with more apps (generate_scenes.py), which have
+# more ties in relevance.
+#
+#   python compare_formulation.py --seeds 5 --generated 12 24 --max-apps 4 8
+
+VARIANTS = {"base": None, "capacity": (True, False), "symmetry": (False, True), "both": (True, True)}
+
+
+def solve(info, app_ids, lods, coefficients, variant, max_apps, env):
+    placement = PlacementModel(info, app_ids, lods, max_apps=max_apps, env=env)
+    placement.set_objective(coefficients, GRB.MAXIMIZE)
+    if VARIANTS[variant] is not None:
+        placement.strengthen(coefficients, *VARIANTS[variant])
+    placement.optimize()
+    statistics = placement.statistics()
+    placement.model.dispose()
+    return statistics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the placement ILP with and without the strengthening cuts.")
+    parser.add_argument("scenes", nargs="*", default=sorted(glob.glob("scenes/scene-*.json")))
+    parser.add_argument("--seeds", type=int, default=3, help="Random POI/question placements per shipped scene.")
+    parser.add_argument("--generated", type=int, nargs="*", default=[12, 24], help="Apps of generated 8 x 6 scenes.")
+    parser.add_argument("--count", type=int, default=3, help="Generated scenes per number of apps.")
+    parser.add_argument("--max-apps", type=int, nargs="+", default=[4, 8], help="Maximum numbers of placed apps.")
+    parser.add_argument("--threads", type=int, default=1, help="Gurobi threads, 1 gives the most stable node counts.")
+    args = parser.parse_args()
+
+    cases = [(scene_path, seed) for scene_path in args.scenes for seed in range(args.seeds)]
+    if args.generated:
+        from generate_scenes import generate_scene, load_catalogue
+        scene_dir = tempfile.mkdtemp(prefix="ui_formulation_")
+        catalogue = load_catalogue()
+        backgrounds = [os.path.join("scenes", "backgrounds", "nsh.jpg")]
+        for num_apps in args.generated:
+            for i in range(args.count):
+                name = f"8x6-a{num_apps}-{i}"
+                cases.append((generate_scene(scene_dir, name, f"0:{name}", catalogue, backgrounds, num_apps=num_apps,
+                                             num_questions=num_apps), None))
+
+    env = gp.Env(params={"OutputFlag": 0, "Threads": args.threads})
+    print(f"{'max apps':>8} {'variant':>9} {'runs':>5} {'nodes':>8} {'iterations':>11} {'solve (ms)':>11} {'max (ms)':>9} "
+          f"{'same obj.':>9}")
+    for max_apps in args.max_apps:
+        rows = {variant: [] for variant in VARIANTS}
+        for scene_path, seed in cases:
+            if seed is not None:
+                random.seed(seed)
+            scene = Scene(scene_path)
+            app_ids = list(scene.apps.keys())
+            info = scene.get_info()
+            coefficients = weighted_objective(info, app_ids, scene.LODS, {"lambda_weight": 0.1})
+            for variant in VARIANTS:
+                rows[variant].append(solve(info, app_ids, scene.LODS, coefficients, variant, max_apps, env))
+
+        for variant, statistics in rows.items():
+            same = sum(abs(s["objective"] - base["objective"]) <= 1e-6 * max(1, abs(base["objective"]))
+                       for s, base in zip(statistics, rows["base"]))
+            times = np.array([s["solve_time"] for s in statistics]) * 1000
+            print(f"{max_apps:>8} {variant:>9} {len(statistics):>5} {np.mean([s['nodes'] for s in statistics]):>8.1f} "
+                  f"{np.mean([s['iterations'] for s in statistics]):>11.1f} {np.median(times):>11.2f} {times.max():>9.2f} "
+                  f"{same:>5}/{len(statistics)}")
+
+
+if __name__ == "__main__":
+    main()
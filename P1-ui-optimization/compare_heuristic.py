@@ -0,0 +1,61 @@
+import argparse
+import glob
+import random
+import time
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from scene import Scene
+from heuristic import HeuristicPlacer
+from objective import interaction_objective, layout_objective
+from placement_model import PlacementModel
+
+# Reports the optimality gap of the solver-free heuristic (heuristic.py) against the Gurobi ILP of main.py on the
+# shipped scenes. The scenes place the POI and the questions panel at random, so each scene is run with several seeds.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the heuristic placement engine with the Gurobi ILP.")
+    parser.add_argument("scenes", nargs="*", default=sorted(glob.glob("scenes/scene-*.json")))
+    parser.add_argument("--seeds", type=int, default=10, help="Random POI/question placements per scene.")
+    parser.add_argument("--restarts", type=int, default=16, help="Greedy restarts of the heuristic.")
+    args = parser.parse_args()
+
+    env = gp.Env(params={"OutputFlag": 0})
+    gaps, heuristic_times, ilp_times = [], [], []
+    print(f"{'scene':<24} {'seed':>4} {'ILP obj':>8} {'ILP (ms)':>9} {'heur. obj':>9} {'heur. (ms)':>10} {'gap':>7}")
+    for scene_path in args.scenes:
+        for seed in range(args.seeds):
+            random.seed(seed)
+            scene = Scene(scene_path)
+            app_ids = list(scene.apps.keys())
+            info = scene.get_info()
+            objective = interaction_objective(info, app_ids, scene.LODS)
+
+            start = time.perf_counter()
+            placement = PlacementModel(info, app_ids, scene.LODS, env=env)
+            placement.set_objective(objective, GRB.MAXIMIZE)
+            placement.optimize()
+            ilp_value = layout_objective(objective, app_ids, placement.results())
+            ilp_times.append(time.perf_counter() - start)
+            placement.model.dispose()
+
+            start = time.perf_counter()
+            placer = HeuristicPlacer(info, app_ids, scene.LODS, objective)
+            heuristic_value = layout_objective(objective, app_ids, placer.solve(args.restarts))
+            heuristic_times.append(time.perf_counter() - start)
+
+            gap = (ilp_value - heuristic_value) / ilp_value if ilp_value > 0 else 0.0
+            gaps.append(gap)
+            print(f"{scene_path:<24} {seed:>4} {ilp_value:>8.4f} {ilp_times[-1] * 1000:>9.1f} {heuristic_value:>9.4f} "
+                  f"{heuristic_times[-1] * 1000:>10.1f} {gap:>7.2%}")
+
+    print(f"\nRuns: {len(gaps)}, optimal: {sum(gap < 1e-6 for gap in gaps)}")
+    print(f"Gap: mean {np.mean(gaps):.2%}, max {np.max(gaps):.2%}")
+    print(f"Time (ms): ILP median {np.median(ilp_times) * 1000:.1f}, heuristic median {np.median(heuristic_times) * 1000:.1f}, "
+          f"heuristic max {np.max(heuristic_times) * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
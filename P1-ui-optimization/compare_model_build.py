@@ -0,0 +1,143 @@
+import argparse
+import itertools
+import time
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from grid import lod_size
+from placement_model import PlacementModel
+
+# Compares the model construction time of the loop-based formulation in main.py with the vectorized
+# PlacementModel, which only creates variables for feasible candidate placements. Only the model build
+# (including m.update()) is timed, nothing is solved, so large grids can be compared without a full Gurobi licence.
+
+LODS = 3
+BLOCK_SIZE = 100
+
+
+def make_info(cols, rows, num_apps):
+    """Creates a synthetic scene description in the format returned by UI.get_info()."""
+    return {
+        "columns": cols,
+        "rows": rows,
+        "block_size": BLOCK_SIZE,
+        "questions_pos": np.array([cols // 2, rows // 2]) * BLOCK_SIZE,
+        "questions_size": np.array([200, 200]),
+        "btn_all_pos": [10, 10],
+        "btn_all_size": np.array([80, 80]),
+        "roi_pos": np.array([cols * BLOCK_SIZE // 4, rows * BLOCK_SIZE // 4]),
+        "roi_rad": 150,
+        "relevance": {f"app-{i}": 1 / (1 + i) for i in range(num_apps)}
+    }
+
+
+def circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height):
+    # Same as UI.circle_rectangle_overlap, copied to keep this script free of tkinter
+    closest_x = max(rect_x, min(circle_x, rect_x + rect_width))
+    closest_y = max(rect_y, min(circle_y, rect_y + rect_height))
+    return (circle_x - closest_x) ** 2 + (circle_y - closest_y) ** 2 <= circle_radius ** 2
+
+
+def build_loops(info, app_ids, env):
+    """Builds the model the way main.py did before the placement model builder: one addVar and LinExpr at a time."""
+    m = gp.Model("ui_optimizer_loops", env=env)
+    cols, rows = info["columns"], info["rows"]
+    x = {}
+    for app, lod, xIdx, yIdx in itertools.product(app_ids, range(LODS), range(cols), range(rows)):
+        x[app, lod, xIdx, yIdx] = m.addVar(vtype=GRB.BINARY, name=f"x_{app}_{lod}_{xIdx}_{yIdx}")
+
+    m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for app in app_ids for lod in range(LODS) for xIdx in range(cols) for yIdx in range(rows)) <= 4)
+
+    for app in app_ids:
+        m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for lod in range(LODS) for xIdx in range(cols) for yIdx in range(rows)) <= 1)
+
+    for app, lod, xIdx, yIdx in itertools.product(app_ids, range(LODS), range(cols), range(rows)):
+        width, height = lod_size(lod)
+        if xIdx + width > cols or yIdx + height > rows:
+            m.addConstr(x[app, lod, xIdx, yIdx] == 0)
+
+    occupied = {(cx, cy): gp.LinExpr() for cx in range(cols) for cy in range(rows)}
+    for app, lod, xIdx, yIdx in itertools.product(app_ids, range(LODS), range(cols), range(rows)):
+        width, height = lod_size(lod)
+        for dx in range(width):
+            for dy in range(height):
+                if xIdx + dx < cols and yIdx + dy < rows:
+                    occupied[xIdx + dx, yIdx + dy] += x[app, lod, xIdx, yIdx]
+    m.addConstrs(occupied[cx, cy] <= 1 for cx, cy in occupied)
+
+    q_x, q_y = info["questions_pos"][0] // info["block_size"], info["questions_pos"][1] // info["block_size"]
+    btn_all_x, btn_all_y = info["btn_all_pos"][0] // info["block_size"], info["btn_all_pos"][1] // info["block_size"]
+    restricted = {lod: [(btn_all_x, btn_all_y), (q_x, q_y)] for lod in range(LODS)}
+    surroundings = {0: [(0, 1), (1, 0), (1, 1)], 1: [(-1, 0), (-1, 1)], 2: [(-1, -1), (0, -1), (1, -1)]}
+    for dx, dy in surroundings[0]:
+        if 0 <= q_x + dx < cols and 0 <= q_y + dy < rows:
+            for lod in range(LODS):
+                restricted[lod].append((q_x + dx, q_y + dy))
+    for app, lod, xIdx, yIdx in itertools.product(app_ids, range(LODS), range(cols), range(rows)):
+        for level in range(1, lod + 1):
+            for dx, dy in surroundings[level]:
+                if 0 <= q_x + dx < cols and 0 <= q_y + dy < rows:
+                    for target in range(level, LODS):
+                        restricted[target].append((q_x + dx, q_y + dy))
+    for lod in range(LODS):
+        m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for app in app_ids for xIdx, yIdx in restricted[lod]) == 0)
+
+    roi_x, roi_y = info["roi_pos"]
+    for lod, xIdx, yIdx in itertools.product(range(LODS), range(cols), range(rows)):
+        width, height = lod_size(lod)
+        if circle_rectangle_overlap(roi_x, roi_y, info["roi_rad"], xIdx * BLOCK_SIZE, yIdx * BLOCK_SIZE, width * BLOCK_SIZE, height * BLOCK_SIZE):
+            m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for app in app_ids) == 0)
+
+    question_x, question_y = q_x + 1, q_y + 1
+    objective = gp.quicksum((info["relevance"][app] / (1 + 0.1 * ((xIdx + 0.5 - question_x) ** 2 + (yIdx + 0.5 - question_y) ** 2)))
+                            * (1 + lod) * x[app, lod, xIdx, yIdx]
+                            for app, lod, xIdx, yIdx in itertools.product(app_ids, range(LODS), range(cols), range(rows)))
+    m.setObjective(objective, GRB.MAXIMIZE)
+    m.update()
+    return m
+
+
+def build_vectorized(info, app_ids, env):
+    placement = PlacementModel(info, app_ids, LODS, name="ui_optimizer_vectorized", env=env)
+    xs, ys = np.meshgrid(np.arange(info["columns"]), np.arange(info["rows"]), indexing="ij")
+    q_x, q_y = info["questions_pos"][0] // info["block_size"] + 1, info["questions_pos"][1] // info["block_size"] + 1
+    relevance = np.array([info["relevance"][app] for app in app_ids])
+    interaction = 1 / (1 + 0.1 * ((xs + 0.5 - q_x) ** 2 + (ys + 0.5 - q_y) ** 2))
+    placement.set_objective(relevance[:, None, None, None] * (1 + np.arange(LODS))[None, :, None, None] * interaction)
+    placement.model.update()
+    return placement.model
+
+
+def time_build(build, info, app_ids, env, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        m = build(info, app_ids, env)
+        best = min(best, time.perf_counter() - start)
+        size = (m.NumVars, m.NumConstrs)
+        m.dispose()
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loop-based and vectorized placement model construction.")
+    parser.add_argument("--grids", nargs="+", default=["8x6", "16x12", "32x24"], help="Grid sizes as COLSxROWS.")
+    parser.add_argument("--apps", nargs="+", type=int, default=[6, 24, 48], help="Numbers of applications.")
+    parser.add_argument("--repeats", type=int, default=3, help="Builds per configuration, the fastest one is reported.")
+    args = parser.parse_args()
+
+    env = gp.Env(params={"OutputFlag": 0})
+    print(f"{'grid':>7} {'apps':>5} {'vars':>9} {'loops (s)':>10} {'constrs':>8} {'candidates':>11} {'vectorized (s)':>15} {'constrs':>8} {'speedup':>8}")
+    for grid in args.grids:
+        cols, rows = (int(v) for v in grid.split("x"))
+        for num_apps in args.apps:
+            info = make_info(cols, rows, num_apps)
+            app_ids = list(info["relevance"].keys())
+            t_loops, (num_vars, constrs_loops) = time_build(build_loops, info, app_ids, env, args.repeats)
+            t_vec, (num_candidates, constrs_vec) = time_build(build_vectorized, info, app_ids, env, args.repeats)
+            print(f"{grid:>7} {num_apps:>5} {num_vars:>9} {t_loops:>10.3f} {constrs_loops:>8} {num_candidates:>11} {t_vec:>15.3f} {constrs_vec:>8} {t_loops / t_vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import random
+import numpy as np
+
+from geometry import grid_circle_overlap
+from scene import Scene
+
+# Seeded scene generator for load testing: writes scene/apps JSON variants with larger grids, more apps, many
+# questions and several POIs. The apps reuse the info entries of the shipped apps-N.json files. Each scene stores its
+# seed, so Scene(path) reproduces the app contents and the question order as well.
+#
+#   python generate_scenes.py --count 100 --grids 8x6 16x12 32x24 --apps 6 50 200 --pois 1 3 --output scenes/generated
+
+DEFAULT_OUTPUT_DIR = os.path.join("scenes", "generated")
+
+
+def parse_grid(grid):
+    """Parses a grid size such as "16x12" into (columns, rows)."""
+    columns, rows = grid.lower().split("x")
+    return int(columns), int(rows)
+
+
+def load_catalogue(pattern=os.path.join("scenes", "apps", "apps-*.json")):
+    """Returns the distinct apps of the shipped apps-N.json files as a list of (name, info entries)."""
+    catalogue = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r") as file:
+            for entry in json.load(file):
+                catalogue.setdefault(entry["app"], entry["info"])
+    return list(catalogue.items())
+
+
+def place_pois(rng, columns, rows, num_pois, tries=100):
+    """
+    Draws POI positions and radii that leave at least one valid questions panel position, and picks that position.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, list of int]: POI positions (num_pois, 2), radii (num_pois,) and the
+        questions panel position in pixels.
+    """
+    width, height = columns * Scene.BLOCK_SIZE, rows * Scene.BLOCK_SIZE
+    for _ in range(tries):
+        poi_pos = np.stack([
+            rng.integers(Scene.POI_PLACEMENT_PADDING, width - Scene.POI_PLACEMENT_PADDING, num_pois, endpoint=True),
+            rng.integers(Scene.POI_PLACEMENT_PADDING, height - Scene.POI_PLACEMENT_PADDING, num_pois, endpoint=True)
+        ], axis=1)
+        poi_size = rng.integers(Scene.POI_RADIUS_MIN, Scene.POI_RADIUS_MAX, num_pois, endpoint=True)
+        # Same rule as Scene.get_valid_question_placements(): not on a POI and not on the "Apps" button
+        overlap = grid_circle_overlap(poi_pos, poi_size, [(2, 2)], Scene.BLOCK_SIZE, columns - 2, rows - 2)
+        overlap = overlap.any(axis=0)[0]
+        overlap[0, 0] = True
+        valid = np.argwhere(~overlap)
+        if len(valid):
+            q_pos = Scene.BLOCK_SIZE * valid[rng.integers(len(valid))]
+            return poi_pos, poi_size, q_pos.tolist()
+    raise ValueError(f"No questions panel position left next to {num_pois} POIs on a {columns} x {rows} grid")
+
+
+def generate_scene(output_dir, name, seed, catalogue, backgrounds, columns=8, rows=6, num_apps=6, num_questions=20,
+                   num_pois=1):
+    """
+    Writes scene-<name>.json and apps-<name>.json to output_dir.
+
+    Args:
+        output_dir (str): Output directory.
+        name (str): Name of the variant.
+        seed (str): Seed of the scene; the same seed and arguments write the same files.
+        catalogue (list of tuple[str, list of dict]): Apps to draw from, see load_catalogue().
+        backgrounds (list of str): Background images to draw from.
+        columns, rows (int): Grid size.
+        num_apps (int): Number of apps.
+        num_questions (int): Number of questions.
+        num_pois (int): Number of POIs.
+
+    Returns:
+        str: Path of the scene file.
+    """
+    rng = np.random.default_rng(random.Random(seed).getrandbits(64))
+
+    templates = rng.integers(len(catalogue), size=num_apps)
+    apps = [{"app": f"{catalogue[t][0]}-{i}", "info": catalogue[t][1]} for i, t in enumerate(templates.tolist())]
+    app_path = os.path.join(output_dir, f"apps-{name}.json")
+    with open(app_path, "w") as file:
+        json.dump(apps, file)
+
+    question_apps = rng.integers(num_apps, size=num_questions)
+    question_lods = rng.integers(Scene.LODS, size=num_questions)
+    questions = []
+    for a, lod in zip(question_apps.tolist(), question_lods.tolist()):
+        label = apps[a]["info"][lod]["label"].rstrip(": ")
+        questions.append({"q": f"What is the {label} of {apps[a]['app']}?", "app": apps[a]["app"], "lod": lod})
+    counts = np.bincount(question_apps, minlength=num_apps)
+    relevance = counts / max(counts.max(), 1)
+
+    poi_pos, poi_size, q_pos = place_pois(rng, columns, rows, num_pois)
+    scene = {
+        "seed": seed,
+        "grid": [columns, rows],
+        "env_path": backgrounds[rng.integers(len(backgrounds))],
+        "app_path": app_path,
+        # A single POI keeps the format of the shipped scenes
+        "poi_pos": poi_pos[0].tolist() if num_pois == 1 else poi_pos.tolist(),
+        "poi_size": int(poi_size[0]) if num_pois == 1 else poi_size.tolist(),
+        "q_pos": q_pos,
+        "questions": questions,
+        "relevance": {app["app"]: float(r) for app, r in zip(apps, relevance)}
+    }
+    scene_path = os.path.join(output_dir, f"scene-{name}.json")
+    with open(scene_path, "w") as file:
+        json.dump(scene, file)
+    return scene_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded scene variants for load testing.")
+    parser.add_argument("--count", type=int, default=10, help="Scenes per combination of grid, apps and POIs.")
+    parser.add_argument("--grids", nargs="+", default=["8x6"], help="Grid sizes, e.g. 8x6 16x12 64x48.")
+    parser.add_argument("--apps", type=int, nargs="+", default=[6], help="Numbers of apps.")
+    parser.add_argument("--questions", type=int, default=20, help="Questions per scene.")
+    parser.add_argument("--pois", type=int, nargs="+", default=[1], help="Numbers of POIs.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    catalogue = load_catalogue()
+    backgrounds = sorted(glob.glob(os.path.join("scenes", "backgrounds", "*.jpg")))
+    scene_paths = []
+    for grid, num_apps, num_pois in itertools.product(args.grids, args.apps, args.pois):
+        columns, rows = parse_grid(grid)
+        for i in range(args.count):
+            name = f"{columns}x{rows}-a{num_apps}-p{num_pois}-{i}"
+            scene_paths.append(generate_scene(args.output, name, f"{args.seed}:{name}", catalogue, backgrounds,
+                                              columns, rows, num_apps, args.questions, num_pois))
+    print(f"Wrote {len(scene_paths)} scenes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
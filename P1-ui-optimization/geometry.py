@@ -0,0 +1,54 @@
+import numpy as np
+
+# Vectorized geometry helpers shared by the UI and the optimizers. The functions broadcast over NumPy arrays, so a
+# single call covers every grid cell, app footprint and Region of Interest (ROI).
+
+
+def circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height):
+    """
+    Checks whether circles overlap axis-aligned rectangles. All arguments are broadcast against each other.
+
+    Args:
+        circle_x, circle_y (array_like): Center of the circles in pixels.
+        circle_radius (array_like): Radius of the circles in pixels.
+        rect_x, rect_y (array_like): Top left corner of the rectangles in pixels.
+        rect_width, rect_height (array_like): Size of the rectangles in pixels.
+
+    Returns:
+        numpy.ndarray: Boolean array of the broadcast shape, True where a circle and a rectangle overlap.
+    """
+    # Find the closest point on the rectangle to the circle's center
+    closest_x = np.clip(circle_x, rect_x, np.add(rect_x, rect_width))
+    closest_y = np.clip(circle_y, rect_y, np.add(rect_y, rect_height))
+
+    # Check if the distance to the closest point is less than or equal to the circle's radius
+    distance_squared = np.square(np.subtract(circle_x, closest_x)) + np.square(np.subtract(circle_y, closest_y))
+    return distance_squared <= np.square(circle_radius)
+
+
+def grid_circle_overlap(circles_pos, circles_radius, sizes, block_size, cols, rows):
+    """
+    Checks every rectangle anchored at a grid cell against one or many circles.
+
+    Args:
+        circles_pos (array_like): Centers of the circles in pixels, shape (2,) or (num_circles, 2).
+        circles_radius (array_like): Radius of each circle in pixels, a scalar or shape (num_circles,).
+        sizes (list of tuple[int, int]): Width and height of each rectangle in grid cells, e.g. one per LoD.
+        block_size (int): Size of a grid cell in pixels.
+        cols, rows (int): Number of anchor columns and rows.
+
+    Returns:
+        numpy.ndarray: Boolean mask of shape (num_circles, len(sizes), cols, rows), True where the rectangle of the
+        given size with its top left corner at cell (xIdx, yIdx) overlaps the circle.
+    """
+    circles_pos = np.atleast_2d(circles_pos)
+    circles_radius = np.broadcast_to(circles_radius, len(circles_pos))
+    sizes = np.asarray(sizes).reshape(-1, 2)
+    circle_x = circles_pos[:, 0, None, None, None]
+    circle_y = circles_pos[:, 1, None, None, None]
+    circle_radius = circles_radius[:, None, None, None]
+    rect_x = (np.arange(cols) * block_size)[None, None, :, None]
+    rect_y = (np.arange(rows) * block_size)[None, None, None, :]
+    rect_width = (sizes[:, 0] * block_size)[None, :, None, None]
+    rect_height = (sizes[:, 1] * block_size)[None, :, None, None]
+    return circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height)
@@ -0,0 +1,115 @@
+from functools import lru_cache
+import numpy as np
+import scipy.sparse as sp
+
+from geometry import grid_circle_overlap
+
+# Grid masks shared by the optimizers: app footprints per LoD and the placements that can never be part of a layout
+# because they leave the grid, cover the "Apps" button or the questions panel, or overlap the Region of Interest (ROI).
+# Placements are indexed by (lod, xIdx, yIdx), with xIdx/yIdx the top left grid cell of the app.
+
+
+def lod_size(lod):
+    """
+    Returns the footprint of an application at the given level of detail.
+
+    Args:
+        lod (int): Level of detail (0-based).
+
+    Returns:
+        tuple[int, int]: Width and height of the application in grid cells.
+    """
+    width = 1 if lod == 0 else 2
+    height = 1 if lod < 2 else 2
+    return width, height
+
+
+def grid_indices(cols, rows):
+    """Returns the (cols, rows) arrays of column and row indices of every grid cell."""
+    return np.meshgrid(np.arange(cols), np.arange(rows), indexing="ij")
+
+
+def footprint_matrix(cols, rows, lods):
+    """
+    Builds the sparse matrix that maps every placement (lod, xIdx, yIdx) to the grid cells it covers.
+
+    Rows are the grid cells in (xIdx, yIdx) order, columns are the placements in (lod, xIdx, yIdx) order.
+    Cells outside of the grid are dropped, out-of-bounds placements are handled by boundary_mask().
+
+    Returns:
+        scipy.sparse.csr_matrix: Binary matrix of shape (cols * rows, lods * cols * rows).
+    """
+    xs, ys = grid_indices(cols, rows)
+    cell_rows, placement_cols = [], []
+    for lod in range(lods):
+        width, height = lod_size(lod)
+        placement = (lod * cols + xs) * rows + ys
+        for dx in range(width):
+            for dy in range(height):
+                inside = (xs + dx < cols) & (ys + dy < rows)
+                cell_rows.append(((xs + dx) * rows + ys + dy)[inside])
+                placement_cols.append(placement[inside])
+    cell_rows = np.concatenate(cell_rows)
+    placement_cols = np.concatenate(placement_cols)
+    data = np.ones(len(cell_rows), dtype=np.int8)
+    return sp.csr_matrix((data, (cell_rows, placement_cols)), shape=(cols * rows, lods * cols * rows))
+
+
+@lru_cache(maxsize=None)
+def load_footprint_matrix(cols, rows, lods):
+    """
+    Returns the footprint matrix of footprint_matrix(), built once per (cols, rows, lods) and shared between solves.
+
+    The matrix is stored column-compressed so the footprints of a set of candidate placements can be sliced out
+    cheaply. It is shared between all callers and must not be modified.
+    """
+    footprint = footprint_matrix(int(cols), int(rows), int(lods)).tocsc()
+    footprint.data.setflags(write=False)
+    return footprint
+
+
+def boundary_mask(cols, rows, lods):
+    """Returns a (lods, cols, rows) boolean mask of placements that do not fit within the grid."""
+    xs, ys = grid_indices(cols, rows)
+    mask = np.zeros((lods, cols, rows), dtype=bool)
+    for lod in range(lods):
+        width, height = lod_size(lod)
+        mask[lod] = (xs + width > cols) | (ys + height > rows)
+    return mask
+
+
+def rect_cells(pos, size, block_size, cols, rows):
+    """Returns a (cols, rows) boolean mask of the grid cells covered by a rectangle given in pixels."""
+    x0, y0 = int(pos[0]) // block_size, int(pos[1]) // block_size
+    x1, y1 = (int(pos[0]) + int(size[0]) - 1) // block_size, (int(pos[1]) + int(size[1]) - 1) // block_size
+    mask = np.zeros((cols, rows), dtype=bool)
+    mask[max(x0, 0):min(x1 + 1, cols), max(y0, 0):min(y1 + 1, rows)] = True
+    return mask
+
+
+def restricted_mask(info, lods, footprint=None):
+    """Returns a (lods, cols, rows) boolean mask of placements that overlap the "Apps" button or the questions panel."""
+    cols, rows, block_size = info["columns"], info["rows"], info["block_size"]
+    if footprint is None:
+        footprint = load_footprint_matrix(cols, rows, lods)
+    blocked = rect_cells(info["btn_all_pos"], info["btn_all_size"], block_size, cols, rows)
+    blocked |= rect_cells(info["questions_pos"], info["questions_size"], block_size, cols, rows)
+    return (footprint.T @ blocked.ravel().astype(np.int8) > 0).reshape(lods, cols, rows)
+
+
+def roi_mask(info, lods):
+    """
+    Returns a (lods, cols, rows) boolean mask of placements that overlap the Region of Interest (ROI).
+
+    info["roi_pos"] and info["roi_rad"] may also hold several ROIs, a placement is masked if it overlaps any of them.
+    """
+    sizes = [lod_size(lod) for lod in range(lods)]
+    overlap = grid_circle_overlap(info["roi_pos"], info["roi_rad"], sizes, info["block_size"], info["columns"], info["rows"])
+    return overlap.any(axis=0)
+
+
+def forbidden_mask(info, lods, footprint=None):
+    """Returns a (lods, cols, rows) boolean mask of placements outside the grid, on restricted areas or on the ROI."""
+    if footprint is None:
+        footprint = load_footprint_matrix(info["columns"], info["rows"], lods)
+    return boundary_mask(info["columns"], info["rows"], lods) | restricted_mask(info, lods, footprint) | roi_mask(info, lods)
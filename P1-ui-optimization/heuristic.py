@@ -0,0 +1,157 @@
+import itertools
+import numpy as np
+
+from grid import load_footprint_matrix, forbidden_mask
+from objective import interaction_objective
+
+# Solver-free placement engine for hosts without a Gurobi licence and for interactive re-layout. It builds a layout
+# greedily and improves it with a local search, scoring placements with the same (apps, lods, columns, rows)
+# objective coefficients as the Gurobi models in main.py and multiStage.py. Only NumPy/SciPy are needed.
+
+
+class HeuristicPlacer:
+    """
+    Greedy + local search placement over the feasible (app, lod, xIdx, yIdx) candidates.
+
+    Args:
+        info (dict): Scene information as returned by UI.get_info().
+        app_ids (list of str): Applications that can be placed.
+        lods (int): Number of levels of detail.
+        coefficients (numpy.ndarray): Objective coefficients broadcastable to (apps, lods, columns, rows);
+            defaults to the Version-3 objective of main.py.
+        max_apps (int): Maximum number of placed applications.
+        forbidden (numpy.ndarray): (lods, columns, rows) mask of infeasible placements; defaults to grid.forbidden_mask().
+    """
+
+    def __init__(self, info, app_ids, lods, coefficients=None, max_apps=4, forbidden=None):
+        self.app_ids = list(app_ids)
+        self.lods = lods
+        self.cols, self.rows = info["columns"], info["rows"]
+        self.max_apps = max_apps
+        self.footprint = load_footprint_matrix(self.cols, self.rows, lods)
+        if forbidden is None:
+            forbidden = forbidden_mask(info, lods, self.footprint)
+        if coefficients is None:
+            coefficients = interaction_objective(info, self.app_ids, lods)
+        self.shape = (len(self.app_ids), lods, self.cols, self.rows)
+        self.coefficients = np.broadcast_to(coefficients, self.shape).reshape(len(self.app_ids), -1).astype(float)
+        self.set_forbidden(forbidden)
+        self.footprint_csr = self.footprint.T.tocsr()
+        self.conflicts = {}
+
+    def set_forbidden(self, forbidden):
+        """Replaces the (lods, columns, rows) mask of infeasible placements, e.g. after the ROI moved."""
+        self.feasible = ~np.asarray(forbidden).reshape(-1)
+        # Pre-mask infeasible placements once, every search step works on this array
+        self.scores = self.coefficients.copy()
+        self.scores[:, ~self.feasible] = -np.inf
+
+    def cells(self, placement):
+        """Returns the grid cells covered by a flat (lod, xIdx, yIdx) placement index."""
+        return self.footprint_csr.indices[self.footprint_csr.indptr[placement]:self.footprint_csr.indptr[placement + 1]]
+
+    def conflict(self, placement):
+        """Returns a boolean mask of the placements that overlap the given one, computed once per placement."""
+        if placement not in self.conflicts:
+            occupied = np.zeros(self.cols * self.rows, dtype=np.int8)
+            occupied[self.cells(placement)] = 1
+            self.conflicts[placement] = (self.footprint_csr @ occupied) > 0
+        return self.conflicts[placement]
+
+    def free_placements(self, layout, skip=None):
+        """Returns a boolean mask of the placements that do not overlap any placed app other than skip."""
+        free = np.ones(self.footprint_csr.shape[0], dtype=bool)
+        for a, placement in layout.items():
+            if a != skip:
+                free &= ~self.conflict(placement)
+        return free
+
+    def best_insertion(self, layout, skip=None):
+        """Returns the (score, app, placement) of the best app that is not placed (or is skip) on a free slot."""
+        scores = np.where(self.free_placements(layout, skip), self.scores, -np.inf)
+        scores[[a for a in layout if a != skip]] = -np.inf
+        a, placement = np.unravel_index(np.argmax(scores), scores.shape)
+        return scores[a, placement], a, placement
+
+    def greedy(self, layout):
+        """Adds the best remaining placement until max_apps apps are placed or nothing improves the objective."""
+        while len(layout) < self.max_apps:
+            score, a, placement = self.best_insertion(layout)
+            if not score > 0:
+                break
+            layout[a] = placement
+        return layout
+
+    def local_search(self, layout, pairs=True, max_moves=100):
+        """
+        Improves a layout by replacing one placed app at a time, with the same app at another slot or LoD or with
+        an app that is not placed. When no single replacement increases the objective, pairs of placed apps are
+        removed and the freed space is refilled greedily.
+        """
+        for _ in range(max_moves):
+            best_gain, best_move = 1e-9, None
+            for a, placement in layout.items():
+                score, b, new_placement = self.best_insertion(layout, skip=a)
+                gain = score - self.scores[a, placement]
+                if gain > best_gain:
+                    best_gain, best_move = gain, (a, b, new_placement)
+            if best_move is not None:
+                a, b, new_placement = best_move
+                del layout[a]
+                layout[b] = new_placement
+                # A move can free cells, so try to fill them again
+                self.greedy(layout)
+                continue
+
+            if not pairs:
+                break
+            # No single replacement helps: remove two placed apps and refill the freed space greedily
+            value = self.value(layout)
+            for a, b in itertools.combinations(list(layout), 2):
+                candidate = self.greedy({c: placement for c, placement in layout.items() if c not in (a, b)})
+                if self.value(candidate) > value + 1e-9:
+                    layout = candidate
+                    break
+            else:
+                break
+        return layout
+
+    def value(self, layout):
+        return float(sum(self.scores[a, placement] for a, placement in layout.items()))
+
+    def solve(self, restarts=16):
+        """
+        Runs the greedy construction and local search, restarted from the best restarts first placements.
+
+        Returns:
+            list of dict: optimal_results in the format expected by UI.init_app().
+        """
+        order = np.argsort(self.scores, axis=None)[::-1][:max(restarts, 1)]
+        best_layout, best_value = {}, 0.0
+        for a, placement in zip(*np.unravel_index(order, self.scores.shape)):
+            if not self.scores[a, placement] > 0:
+                break
+            layout = self.local_search(self.greedy({a: placement}), pairs=False)
+            if self.value(layout) > best_value:
+                best_layout, best_value = layout, self.value(layout)
+        # The pair moves are the expensive part of the local search, only run them on the best restart
+        best_layout = self.local_search(best_layout)
+        best_value = self.value(best_layout)
+        self.objective_value = best_value
+        return self.results(best_layout)
+
+    def results(self, layout):
+        optimal_results = []
+        for a in sorted(layout):
+            lod, xIdx, yIdx = np.unravel_index(layout[a], self.shape[1:])
+            optimal_results.append({
+                "name": self.app_ids[a],
+                "lod": int(lod),
+                "placement": [int(xIdx), int(yIdx)]
+            })
+        return optimal_results
+
+
+def heuristic_placement(info, app_ids, lods, coefficients=None, max_apps=4, restarts=16):
+    """Solver-free replacement for the Gurobi model of main.py, returns optimal_results for UI.init_app()."""
+    return HeuristicPlacer(info, app_ids, lods, coefficients, max_apps).solve(restarts)
@@ -1,34 +1,7 @@
-from ui import UI 
-import gurobipy as gp 
-from gurobipy import GRB
-import itertools
-import random
+from scene import Scene
+import argparse
 import sys
-import numpy as np
-
-# Load scene information
-scene_path = "scenes/scene-1.json"
-if len(sys.argv) >= 2:
-    scene_path = sys.argv[1]
-
-# Loads target scene
-# default: scene.json
-scene_UI = UI(scene_path)
-
-# Gets available applications
-app_ids = list(scene_UI.apps.keys())
-
-# Get scene information
-info = scene_UI.get_info()
-# print(info)
-
-# Creates a model
-m = gp.Model("ui_optimizer")
-
-# Decision variables: x[app, lod, xIdx, yIdx] = 1 if app is placed at (xIdx, yIdx) with lod
-x = {}
-for app, lod, xIdx, yIdx in itertools.product(app_ids, range(scene_UI.LODS), range(info["columns"]), range(info["rows"])):
-    x[app, lod, xIdx, yIdx] = m.addVar(vtype=GRB.BINARY, name=f"x_{app}_{lod}_{xIdx}_{yIdx}")
+from objective import TERMS, weighted_objective
 
 ##### TODO: DEFINE OBJECTIVES AND CONSTRAINTS #####
 '''
@@ -38,7 +11,7 @@ optimal_results (list of dict): A list where each dictionary contains:
             - "lod" (int): Level of detail (e.g., 0 or 1).
             - "placement" (list of int): A list of two integers indicating the placement slot (e.g., [4, 4]; NOTE: This specifies the placement slot rather than the exact placement position)
 
-Potentially relevant information can be obtained by calling scene_UI.get_info(), which returns a dictionary containing:
+Potentially relevant information can be obtained by calling scene.get_info(), which returns a dictionary containing:
 - "columns" (int): Number of columns in the UI grid.
 - "rows" (int): Number of rows in the UI grid.
 - "block_size" (int): Size of each block in the grid.
@@ -51,128 +24,131 @@ Potentially relevant information can be obtained by calling scene_UI.get_info(),
 - "relevance" (dict[str, float]): A dictionary mapping application names to their relevance scores.
 '''
 
-# Constraint 1: Max 4 elements placed
-m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for app in app_ids for lod in range(scene_UI.LODS) for xIdx in range(info["columns"]) for yIdx in range(info["rows"])) <= 4)
-
-# Constraint 2: Each app is placed at most once with one LoD
-for app in app_ids:
-    m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for lod in range(scene_UI.LODS) for xIdx in range(info["columns"]) for yIdx in range(info["rows"])) <= 1)
-
-# Constraint 3: Ensure apps fit within grid boundaries considering their size
-for app, lod, xIdx, yIdx in itertools.product(app_ids, range(scene_UI.LODS), range(info["columns"]), range(info["rows"])):
-    width = 1 if lod == 0 else 2
-    height = 1 if lod < 2 else 2
-    if xIdx + width > info["columns"] or yIdx + height > info["rows"]:
-        m.addConstr(x[app, lod, xIdx, yIdx] == 0)
-
-# Constraint 4: Prevent overlapping between apps, considering dif lod of apps
-occupied = {(x, y): gp.LinExpr() for x in range(info["columns"]) for y in range(info["rows"]) }
-for app, lod, xIdx, yIdx in itertools.product(app_ids, range(scene_UI.LODS), range(info["columns"]), range(info["rows"])):
-    width = 1 if lod == 0 else 2
-    height = 1 if lod < 2 else 2
-    for dx in range(width):
-        for dy in range(height):
-            if xIdx + dx < info["columns"] and yIdx + dy < info["rows"]:
-                occupied[xIdx + dx, yIdx + dy] += x[app, lod, xIdx, yIdx]
-m.addConstrs(occupied[x, y] <= 1 for x, y in occupied)
-
-# Constraint 5: Avoid overlapping "All Apps" button & questions panel, considering dif lod of apps
-q_x, q_y = info["questions_pos"][0] // info["block_size"], info["questions_pos"][1] // info["block_size"]
-btn_all_x, btn_all_y = info["btn_all_pos"][0] // info["block_size"], info["btn_all_pos"][1] // info["block_size"]
-restricted_areas_for_lod_0 = [(btn_all_x, btn_all_y), (q_x, q_y)]
-restricted_areas_for_lod_1 = [(btn_all_x, btn_all_y), (q_x, q_y)]
-restricted_areas_for_lod_2 = [(btn_all_x, btn_all_y), (q_x, q_y)]
-surroundings_for_lod_012 = [(0, 1), (1, 0), (1, 1)]
-surroundings_for_lod_12 = [(-1, 0), (-1, 1)]
-surroundings_for_lod_2 = [(-1, -1), (0, -1), (1, -1)]
-for dx, dy in surroundings_for_lod_012:
-    nx, ny = q_x + dx, q_y + dy
-    if 0 <= nx < info["columns"] and 0 <= ny < info["rows"]:
-        restricted_areas_for_lod_0.append((nx, ny))
-        restricted_areas_for_lod_1.append((nx, ny))
-        restricted_areas_for_lod_2.append((nx, ny))
-for app, lod, xIdx, yIdx in itertools.product(app_ids, range(scene_UI.LODS), range(info["columns"]), range(info["rows"])):
-    if lod == 1 or lod == 2:
-        for dx, dy in surroundings_for_lod_12:
-            nx, ny = q_x + dx, q_y + dy
-            if 0 <= nx < info["columns"] and 0 <= ny < info["rows"]:
-                restricted_areas_for_lod_1.append((nx, ny))
-                restricted_areas_for_lod_2.append((nx, ny))
-    if lod == 2:
-        for dx, dy in surroundings_for_lod_2:
-            nx, ny = q_x + dx, q_y + dy
-            if 0 <= nx < info["columns"] and 0 <= ny < info["rows"]:
-                restricted_areas_for_lod_2.append((nx, ny))
-
-m.addConstr(gp.quicksum(x[app, 0, xIdx, yIdx] for app in app_ids for xIdx, yIdx in restricted_areas_for_lod_0) == 0)
-m.addConstr(gp.quicksum(x[app, 1, xIdx, yIdx] for app in app_ids for xIdx, yIdx in restricted_areas_for_lod_1) == 0)
-m.addConstr(gp.quicksum(x[app, 2, xIdx, yIdx] for app in app_ids for xIdx, yIdx in restricted_areas_for_lod_2) == 0)
-
-# Constraint 6: Avoid overlapping Region of Interest (ROI)
-roi_x, roi_y = info["roi_pos"]
-roi_radius = info["roi_rad"]
-# print(f"ROI_Center: {roi_x}, {roi_y} , ROI_Radius: {roi_radius}")
-for lod in range(scene_UI.LODS):
-    for xIdx in range(info["columns"]):
-        for yIdx in range(info["rows"]):
-            width = 1 if lod == 0 else 2
-            height = 1 if lod < 2 else 2
-            if scene_UI.circle_rectangle_overlap(roi_x, roi_y, roi_radius, xIdx * info['block_size'], yIdx * info['block_size'], width * info['block_size'], height * info['block_size']):
-                # print(f"Overlap Pos: {xIdx}, {yIdx}, LoD: {lod}")
-                m.addConstr(gp.quicksum(x[app, lod, xIdx, yIdx] for app in app_ids) == 0)
-          
-# Bonus-1: Automatically calculate relevance(Implemented in ui.py)
-# print app with its relevance score
-for app in app_ids:
-    print(f"{app}: {scene_UI.relevance[app]}")
+# Thin CLI around placement.solve_single_stage(), which can also be called in-process (batch.py, benchmark.py)
 
 
 # # Version-1: Relevance
 # # Objective Function: Maximize sum of relevance scores
-# objective = gp.quicksum(scene_UI.relevance[app] * x[app, lod, xIdx, yIdx] 
+# objective = gp.quicksum(scene.relevance[app] * x[app, lod, xIdx, yIdx] 
 #                         for app in app_ids 
-#                         for lod in range(scene_UI.LODS) 
+#                         for lod in range(scene.LODS) 
 #                         for xIdx in range(info["columns"]) 
 #                         for yIdx in range(info["rows"]))
 
 
 # # Version-2: Relevance, LoD Preference
 # # Objective Function: Maximize sum of relevance scores * LoD.weight
-# objective = gp.quicksum(scene_UI.relevance[app] * (1 + 0.5 * lod) * x[app, lod, xIdx, yIdx] 
+# objective = gp.quicksum(scene.relevance[app] * (1 + 0.5 * lod) * x[app, lod, xIdx, yIdx] 
 #                             for app in app_ids 
-#                             for lod in range(scene_UI.LODS) 
+#                             for lod in range(scene.LODS) 
 #                             for xIdx in range(info["columns"]) 
 #                             for yIdx in range(info["rows"]))
 
 
-# Version-3: Relevance, LoD Preference, and Interaction Cost
-lambda_weight = 0.1  # Interaction cost penalty weight
-question_x, question_y = info["questions_pos"][0] // info["block_size"] + 1 , info["questions_pos"][1] // info["block_size"] + 1 # Center of questions panel(2 x 2)
-width = 1 if 0 == 0 else 2
-height = 1 if 0 < 2 else 2
-objective = gp.quicksum((scene_UI.relevance[app] / (1 + lambda_weight * ((xIdx + width / 2 - question_x) ** 2 + (yIdx + height / 2 - question_y) ** 2))) 
-                        * (1 + lod) * x[app, lod, xIdx, yIdx]
-                        for app in app_ids 
-                        for lod in range(scene_UI.LODS) 
-                        for xIdx in range(info["columns"]) 
-                        for yIdx in range(info["rows"]))
-
-# Setting up the model in Gurobi and optimizing it
-m.ModelSense = GRB.MAXIMIZE
-m.setObjective(objective)
-m.update()
-m.optimize()
-
-
-# Extract optimal results
-optimal_results = []
-for app, lod, xIdx, yIdx in itertools.product(app_ids, range(scene_UI.LODS), range(info["columns"]), range(info["rows"])):
-    if x[app, lod, xIdx, yIdx].X == 1:
-        optimal_results.append({
-            "name": app,
-            "lod": lod,
-            "placement": [xIdx, yIdx]
-        })
-
-# Start optimized UI
-scene_UI.init_app(optimal_results)
+def main():
+    # Load scene information
+    parser = argparse.ArgumentParser(description="Optimize the visibility, placement and level of detail of the UI.")
+    parser.add_argument("scene_path", nargs="?", default="scenes/scene-1.json")
+    parser.add_argument("--solver", choices=["gurobi", "heuristic"], default="gurobi",
+                        help="Solve the ILP with Gurobi or use the solver-free greedy + local search heuristic.")
+    parser.add_argument("--relevance-index", help="Look the relevance up in a prebuilt index (see relevance_index.py).")
+    parser.add_argument("--lod-demand", action="store_true",
+                        help="Weight LoDs by the LoDs the questions of the scene ask for instead of (1 + lod).")
+    parser.add_argument("--terms", nargs="+", choices=sorted(TERMS),
+                        help="Objective terms instead of Version-3 (relevance, LoD preference, interaction cost).")
+    parser.add_argument("--time-limit", type=float, help="Time limit of the solve in seconds.")
+    parser.add_argument("--strengthen", action="store_true",
+                        help="Add capacity and symmetry breaking cuts to the ILP (see compare_formulation.py).")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse the stored placement of identical inputs instead of solving again (see result_cache.py).")
+    parser.add_argument("--binary-log", action="store_true",
+                        help="Also log the trials to a typed .npz file for aggregation (see study_log.py).")
+    parser.add_argument("--cache-dir", default=None, help="Directory of the result cache, default: .cache/results.")
+    args = parser.parse_args()
+    scene_path = args.scene_path
+
+    # Loads target scene without opening a window (see scene.py)
+    # default: scene.json
+    relevance_index = None
+    try:
+        if args.relevance_index or args.lod_demand:
+            from relevance_index import RelevanceIndex
+            if args.relevance_index:
+                try:
+                    relevance_index = RelevanceIndex.load(args.relevance_index)
+                except FileNotFoundError:
+                    print(f"Relevance index not found: {args.relevance_index}, counting the questions of the scene",
+                          file=sys.stderr)
+            # Not indexed or edited since it was indexed
+            if relevance_index is None or scene_path not in relevance_index:
+                relevance_index = RelevanceIndex.build([scene_path])
+        scene = Scene(scene_path, relevance_index=relevance_index)
+    except (OSError, ValueError, KeyError) as error:
+        sys.exit(f"Could not load the scene: {error}")
+
+    # Gets available applications
+    app_ids = list(scene.apps.keys())
+
+    # Get scene information
+    info = scene.get_info()
+    # print(info)
+
+    # Bonus-1: Automatically calculate relevance(Implemented in scene.py)
+    # print app with its relevance score
+    for app in app_ids:
+        print(f"{app}: {scene.relevance[app]}")
+
+    # Version-3: Relevance, LoD Preference, and Interaction Cost (see objective.weighted_objective())
+    # With --terms: relevance, LoD preference and the chosen terms, e.g. interaction cost, ROI proximity, reading cost
+    weights = {"lambda_weight": 0.1}  # Interaction cost penalty weight
+    if args.lod_demand:
+        weights["lod_weight"] = relevance_index.lod_weights(scene_path, app_ids, scene.LODS)
+    if args.terms:
+        weights["terms"] = args.terms
+
+    # Look up the placement of identical resolved inputs (grid, panels, ROI, relevance, weights) in the result cache
+    cache, cache_key, optimal_results = None, None, None
+    if args.cache:
+        from result_cache import ResultCache, DEFAULT_CACHE_DIR, scene_key
+        cache = ResultCache(args.cache_dir or DEFAULT_CACHE_DIR)
+        formulation = "heuristic" if args.solver == "heuristic" else "single-stage"
+        options = {"strengthen": True} if args.strengthen and args.solver == "gurobi" else None
+        cache_key = scene_key(info, app_ids, scene.LODS, formulation, weights, options)
+        optimal_results = cache.get(cache_key)
+
+    # Only complete layouts are stored, not empty or time-limited ones
+    cacheable = False
+    if optimal_results is not None:
+        print("Result cache hit, skipping the solve")
+    elif args.solver == "heuristic":
+        # Greedy + local search on the same objective, no Gurobi licence needed (see heuristic.py)
+        from heuristic import heuristic_placement
+        optimal_results = heuristic_placement(info, app_ids, scene.LODS, weighted_objective(info, app_ids, scene.LODS, weights))
+        cacheable = len(optimal_results) > 0
+    else:
+        # Creates a model with decision variables x[app, lod, xIdx, yIdx] = 1 if app is placed at (xIdx, yIdx) with lod
+        # The placement model adds the constraints on construction (see placement_model.py):
+        # Constraint 1: Max 4 elements placed
+        # Constraint 2: Each app is placed at most once with one LoD
+        # Constraint 3: Ensure apps fit within grid boundaries considering their size
+        # Constraint 4: Prevent overlapping between apps, considering dif lod of apps
+        # Constraint 5: Avoid overlapping "All Apps" button & questions panel, considering dif lod of apps
+        # Constraint 6: Avoid overlapping Region of Interest (ROI)
+        # gurobipy is only imported here, --solver heuristic runs without it
+        from gurobipy import GRB
+        from placement import solve_single_stage
+        result = solve_single_stage(info, app_ids, scene.LODS, weights, args.time_limit, strengthen=args.strengthen)
+        optimal_results = result["optimal_results"]
+        print(f"Build {result['build_time']:.4f}s, solve {result['solve_time']:.4f}s, gap {result['gap']}")
+        cacheable = result["status"] == GRB.OPTIMAL and len(optimal_results) > 0
+
+    if cache is not None and cacheable:
+        cache.put(cache_key, optimal_results)
+
+    # Start optimized UI, tkinter and PIL are only imported here
+    from ui import UI
+    UI(scene=scene).init_app(optimal_results, binary_log=args.binary_log)
+
+
+if __name__ == "__main__":
+    main()
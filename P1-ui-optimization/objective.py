@@ -0,0 +1,172 @@
+import functools
+import numpy as np
+
+from grid import grid_indices, lod_size
+
+# Objective coefficients of the placement optimizers as dense (apps, lods, columns, rows) arrays, so the Gurobi models
+# and the solver-free heuristic score placements with exactly the same numbers.
+#
+# The coefficients are the product of terms. A term is a function term(info, app_ids, lods) that returns an array
+# broadcastable to (apps, lods, columns, rows); parameters are bound with functools.partial, e.g.
+# functools.partial(interaction_term, lambda_weight=0.2). objective_coefficients() multiplies the terms in one
+# broadcast step, both the single-stage and the two-stage optimizers (placement.py) accept the result.
+
+
+def placement_centers(info, lods, anchor_offset=None):
+    """
+    Returns the point of every placement that distances are measured from, in grid cells.
+
+    Args:
+        info (dict): Scene information as returned by UI.get_info().
+        lods (int): Number of levels of detail.
+        anchor_offset (float): Offset from the top left cell of a placement; None uses the centroid of the
+            footprint of each LoD (grid.lod_size()).
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: X and Y of shape (lods, columns, rows).
+    """
+    xs, ys = grid_indices(info["columns"], info["rows"])
+    if anchor_offset is None:
+        offset_x, offset_y = np.array([lod_size(lod) for lod in range(lods)], dtype=float).T / 2
+    else:
+        offset_x = offset_y = np.full(lods, anchor_offset, dtype=float)
+    return xs[None, :, :] + offset_x[:, None, None], ys[None, :, :] + offset_y[:, None, None]
+
+
+def relevance_term(info, app_ids, lods):
+    """Relevance of each app, shape (apps, 1, 1, 1)."""
+    relevance = np.array([info["relevance"][app] for app in app_ids], dtype=float)
+    return relevance[:, None, None, None]
+
+
+def lod_term(info, app_ids, lods, lod_weight=None):
+    """
+    LoD preference, shape (apps, lods, 1, 1).
+
+    Args:
+        lod_weight (numpy.ndarray): LoD weights of shape (lods,) or (len(app_ids), lods), e.g. the LoD demand of
+            RelevanceIndex.lod_weights(); defaults to (1 + lod).
+    """
+    if lod_weight is None:
+        lod_weight = 1 + np.arange(lods)
+    return np.broadcast_to(lod_weight, (len(app_ids), lods))[:, :, None, None]
+
+
+def interaction_term(info, app_ids, lods, lambda_weight=0.1, anchor_offset=None):
+    """
+    Interaction cost 1 / (1 + lambda_weight * dist^2), shape (1, lods, columns, rows), where dist is the distance in
+    grid cells between a placement and the center of the questions panel.
+    """
+    # Center of questions panel(2 x 2)
+    question_x = info["questions_pos"][0] // info["block_size"] + 1
+    question_y = info["questions_pos"][1] // info["block_size"] + 1
+    xs, ys = placement_centers(info, lods, anchor_offset)
+    return (1 / (1 + lambda_weight * ((xs - question_x) ** 2 + (ys - question_y) ** 2)))[None]
+
+
+def roi_term(info, app_ids, lods, roi_weight=0.5, anchor_offset=None):
+    """
+    ROI proximity 1 - roi_weight * exp(-(dist / roi_rad)^2), shape (1, lods, columns, rows), where dist is the distance
+    in pixels between a placement and the center of the ROI; the product over the ROIs if there are several.
+    Overlapping placements are excluded by the constraints already, this term keeps apps from crowding around the ROI.
+    """
+    xs, ys = placement_centers(info, lods, anchor_offset)
+    roi_pos = np.atleast_2d(info["roi_pos"])[:, :, None, None, None]
+    roi_rad = np.broadcast_to(info["roi_rad"], len(roi_pos))[:, None, None, None]
+    dist = np.hypot(xs * info["block_size"] - roi_pos[:, 0], ys * info["block_size"] - roi_pos[:, 1])
+    return np.prod(1 - roi_weight * np.exp(-(dist / roi_rad) ** 2), axis=0)[None]
+
+
+def reading_term(info, app_ids, lods, reading_weight=0.1):
+    """Reading cost 1 / (1 + reading_weight * lod), shape (1, lods, 1, 1): each LoD adds one line of text to read."""
+    return (1 / (1 + reading_weight * np.arange(lods)))[None, :, None, None]
+
+
+TERMS = {
+    "interaction": interaction_term,
+    "roi": roi_term,
+    "reading": reading_term
+}
+
+
+def objective_coefficients(info, app_ids, lods, terms=()):
+    """
+    Multiplies relevance, the LoD preference and the given terms into the objective coefficients.
+
+    Args:
+        info (dict): Scene information as returned by UI.get_info().
+        app_ids (list of str): Applications in the order of the first axis.
+        lods (int): Number of levels of detail.
+        terms (list of callable): Additional terms, e.g. [interaction_term, roi_term]; relevance_term and lod_term
+            are always included unless a partial of lod_term is passed.
+
+    Returns:
+        numpy.ndarray: Coefficients of shape (len(app_ids), lods, columns, rows).
+    """
+    terms = list(terms)
+    if not any(getattr(term, "func", term) is lod_term for term in terms):
+        terms.insert(0, lod_term)
+    factors = [relevance_term(info, app_ids, lods)] + [term(info, app_ids, lods) for term in terms]
+    shape = (len(app_ids), lods, info["columns"], info["rows"])
+    return functools.reduce(np.multiply, factors, np.ones(shape))
+
+
+def named_terms(names, lambda_weight=0.1, lod_weight=None):
+    """Returns the terms for a list of names from TERMS, measured from the footprint centroid, for the CLIs."""
+    terms = [functools.partial(lod_term, lod_weight=lod_weight)]
+    for name in names:
+        term = TERMS[name]
+        terms.append(functools.partial(term, lambda_weight=lambda_weight) if term is interaction_term else term)
+    return terms
+
+
+def weighted_objective(info, app_ids, lods, weights=None, anchor_offset=None):
+    """
+    Builds the objective coefficients from a dict of weights, as used by the solve functions of placement.py and the
+    result cache.
+
+    Args:
+        weights (dict): Optional "lambda_weight" (default 0.1), "lod_weight" (see lod_term()) and "terms", a list of
+            names from TERMS; without "terms" the Version-3 objective of interaction_objective() is used.
+        anchor_offset (float): Anchor of the Version-3 objective, see interaction_objective().
+    """
+    weights = weights or {}
+    lambda_weight = weights.get("lambda_weight", 0.1)
+    lod_weight = weights.get("lod_weight")
+    if weights.get("terms"):
+        return objective_coefficients(info, app_ids, lods, named_terms(weights["terms"], lambda_weight, lod_weight))
+    return interaction_objective(info, app_ids, lods, lambda_weight, anchor_offset, lod_weight)
+
+
+def interaction_objective(info, app_ids, lods, lambda_weight=0.1, anchor_offset=None, lod_weight=None):
+    """
+    Version-3 objective of main.py: relevance, LoD preference and interaction cost.
+
+    Each placement scores relevance / (1 + lambda_weight * dist^2) * (1 + lod), where dist is the distance in grid
+    cells between the placement and the center of the questions panel. The placement is located at the centroid of
+    its LoD footprint; the fixed offsets used before, the center of a LoD-0 footprint (0.5) for every LoD in main.py
+    and the top left cell (0) in multiStage.py, can still be passed as anchor_offset.
+
+    Args:
+        info (dict): Scene information as returned by UI.get_info().
+        app_ids (list of str): Applications in the order of the first axis.
+        lods (int): Number of levels of detail.
+        lambda_weight (float): Interaction cost penalty weight.
+        anchor_offset (float): Offset in grid cells from the top left cell of a placement; None uses the footprint
+            centroid.
+        lod_weight (numpy.ndarray): LoD weights of shape (lods,) or (len(app_ids), lods), e.g. the LoD demand of
+            RelevanceIndex.lod_weights(); defaults to (1 + lod).
+
+    Returns:
+        numpy.ndarray: Coefficients of shape (len(app_ids), lods, columns, rows).
+    """
+    return objective_coefficients(info, app_ids, lods, [
+        functools.partial(lod_term, lod_weight=lod_weight),
+        functools.partial(interaction_term, lambda_weight=lambda_weight, anchor_offset=anchor_offset)
+    ])
+
+
+def layout_objective(coefficients, app_ids, optimal_results):
+    """Returns the objective value of a list of placements in the optimal_results format."""
+    return float(sum(coefficients[app_ids.index(result["name"]), result["lod"], result["placement"][0], result["placement"][1]]
+                     for result in optimal_results))
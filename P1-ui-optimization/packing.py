@@ -0,0 +1,95 @@
+import numpy as np
+
+from grid import forbidden_mask, load_footprint_matrix, lod_size
+
+# Exact packing feasibility oracle for Stage 1 of multiStage.py: decides whether apps with the given LoDs can all be
+# placed on the grid without overlapping each other, the "Apps" button, the questions panel or the ROI, i.e. whether
+# Stage 2 can place a selection. Every allowed placement (lod, xIdx, yIdx) is precomputed as a bitmask of the grid
+# cells it covers (a Python int, bit xIdx * rows + yIdx), and a depth-first search places the apps largest first.
+# Apps are interchangeable here, so the answer only depends on the number of apps per LoD and is cached by it.
+
+
+class PackingOracle:
+    """
+    Packing feasibility of LoD selections on one scene.
+
+    Args:
+        info (dict): Scene information as returned by Scene.get_info().
+        lods (int): Number of levels of detail.
+    """
+
+    def __init__(self, info, lods):
+        self.lods = lods
+        cols, rows = info["columns"], info["rows"]
+        footprint = load_footprint_matrix(cols, rows, lods).tocsc()
+        forbidden = forbidden_mask(info, lods, footprint).reshape(lods, -1)
+        weights = 1 << np.arange(cols * rows, dtype=object)
+        # masks[lod]: cell bitmasks of the allowed placements of the LoD, in (xIdx, yIdx) order
+        self.masks = []
+        for lod in range(lods):
+            placements = lod * cols * rows + np.flatnonzero(~forbidden[lod])
+            self.masks.append([int(weights[footprint.indices[footprint.indptr[p]:footprint.indptr[p + 1]]].sum())
+                               for p in placements])
+        self.areas = [int(np.prod(lod_size(lod))) for lod in range(lods)]
+        self.cache = {}
+        self.searches = 0
+
+    def counts(self, lods):
+        """Returns the number of apps per LoD of a list of LoDs, the cache key of feasible()."""
+        return tuple(np.bincount(np.asarray(lods, dtype=int), minlength=self.lods).tolist())
+
+    def feasible(self, lods):
+        """
+        Checks whether apps with the given LoDs can be placed together.
+
+        Args:
+            lods (list of int): LoD of each app.
+
+        Returns:
+            bool: True if a non-overlapping placement of all apps exists.
+        """
+        key = self.counts(lods)
+        if key not in self.cache:
+            self.searches += 1
+            self.cache[key] = self.pack(key) is not None
+        return self.cache[key]
+
+    def pack(self, counts):
+        """
+        Searches a placement for the given number of apps per LoD.
+
+        Returns:
+            list of tuple[int, int]: (lod, placement index into masks[lod]) of each app, or None if there is none.
+        """
+        # Largest LoDs first, they have the fewest placements left
+        items = [lod for lod in sorted(range(self.lods), key=lambda lod: -self.areas[lod]) for _ in range(counts[lod])]
+        packing = []
+
+        def search(i, used, first):
+            if i == len(items):
+                return True
+            lod = items[i]
+            # Upper bound: the cells that the remaining apps can still cover must fit their total area
+            free = [mask for mask in self.masks[lod][first:] if not mask & used]
+            remaining = items[i:].count(lod)
+            if len(free) < remaining:
+                return False
+            reachable = 0
+            for other in set(items[i:]):
+                for mask in (free if other == lod else self.masks[other]):
+                    if not mask & used:
+                        reachable |= mask
+            if bin(reachable).count("1") < sum(self.areas[other] for other in items[i:]):
+                return False
+
+            for p, mask in enumerate(self.masks[lod][first:], first):
+                if mask & used:
+                    continue
+                packing.append((lod, p))
+                # Apps of the same LoD are interchangeable, place them in increasing placement order
+                if search(i + 1, used | mask, p + 1 if i + 1 < len(items) and items[i + 1] == lod else 0):
+                    return True
+                packing.pop()
+            return False
+
+        return packing if search(0, 0, 0) else None
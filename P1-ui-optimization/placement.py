@@ -0,0 +1,244 @@
+import itertools
+import time
+import gurobipy as gp
+from gurobipy import GRB
+
+from objective import weighted_objective
+from packing import PackingOracle
+from placement_model import PlacementModel
+
+# Library API of the optimizers in main.py (single stage) and multiStage.py (two stages). They take the scene
+# information returned by Scene.get_info() and return optimal_results for UI.init_app() together with timing and gap
+# statistics, so they can run headless in-process, e.g. in the batch runner, the benchmark or a service. The objective
+# is given as a dict of weights (objective.weighted_objective()) or as precomputed coefficients. An optional Gurobi
+# environment controls logging and thread limits.
+
+
+def solve_single_stage(info, app_ids, lods=3, weights=None, time_limit=None, coefficients=None, env=None, max_apps=4,
+                       strengthen=False):
+    """
+    Places apps with the single-stage ILP of main.py.
+
+    Args:
+        info (dict): Scene information as returned by Scene.get_info().
+        app_ids (list of str): Applications that can be placed.
+        lods (int): Number of levels of detail.
+        weights (dict): Objective weights, see objective.weighted_objective(); defaults to the Version-3 objective
+            of main.py.
+        time_limit (float): Optional time limit of the solve in seconds; the best layout found so far is returned.
+        coefficients (numpy.ndarray): Objective coefficients broadcastable to (apps, lods, columns, rows), used
+            instead of weights.
+        env (gurobipy.Env): Gurobi environment used for the model.
+        max_apps (int): Maximum number of placed applications.
+        strengthen (bool): Add the capacity cut and the symmetry breaking constraints of PlacementModel.strengthen().
+
+    Returns:
+        dict: "optimal_results" in the format expected by UI.init_app(), the statistics of
+        PlacementModel.statistics(), "build_time" and "total_time" in seconds.
+    """
+    start = time.perf_counter()
+    if coefficients is None:
+        coefficients = weighted_objective(info, app_ids, lods, weights)
+    placement = PlacementModel(info, app_ids, lods, name="ui_optimizer", max_apps=max_apps, env=env)
+    placement.set_objective(coefficients, GRB.MAXIMIZE)
+    if strengthen:
+        placement.strengthen(coefficients)
+    if time_limit is not None:
+        placement.model.Params.TimeLimit = time_limit
+    placement.model.update()
+    build_time = time.perf_counter() - start
+
+    placement.optimize()
+    result = {"optimal_results": placement.results(), "build_time": build_time}
+    result.update(placement.statistics())
+    placement.model.dispose()
+    result["total_time"] = time.perf_counter() - start
+    return result
+
+
+def select_apps(info, app_ids, lods, max_apps=4, env=None, time_limit=None, verbose=False):
+    """
+    Stage 1 of multiStage.py: selects the apps and their LoD by relevance, only selections that can be packed.
+
+    Whether the selected LoDs fit on the grid next to the "Apps" button, the questions panel and the ROI is checked
+    exactly by a packing oracle (packing.py) in a lazy constraint callback, so Stage 2 can place every selection.
+
+    Returns:
+        list of tuple[str, int]: The selected (app, lod) pairs.
+    """
+    relevance = info["relevance"]
+    oracle = PackingOracle(info, lods)
+    m1 = gp.Model("ui_selection", env=env)
+    m1.Params.LazyConstraints = 1
+    if time_limit is not None:
+        m1.Params.TimeLimit = time_limit
+
+    # Decision Variables: y[app, lod] = 1 if app is selected with lod
+    y = m1.addVars(app_ids, range(lods), vtype=GRB.BINARY, name="y")
+
+    # Constraint 1-1: Max 4 applications placed
+    m1.addConstr(y.sum() <= max_apps)
+
+    # Constraint 1-2: Each app can only be selected with one LoD
+    m1.addConstrs(y.sum(app, "*") <= 1 for app in app_ids)
+
+    # Constraint 1-3: Ensure selected applications can be packed on the grid (lazy, checked by the oracle)
+    cuts = []
+
+    def packable(model, where):
+        if where != GRB.Callback.MIPSOL:
+            return
+        values = model.cbGetSolution(y)
+        selection = [(app, lod) for (app, lod), value in values.items() if value > 0.5]
+        if not oracle.feasible([lod for _, lod in selection]):
+            # The same apps with the same or larger LoDs cannot be packed either
+            model.cbLazy(gp.quicksum(y[app, larger] for app, lod in selection for larger in range(lod, lods))
+                         <= len(selection) - 1)
+            cuts.append(selection)
+
+    # Objective Function: Maximize relevance * LoD weight
+    m1.setObjective(gp.quicksum(relevance[app] * (1 + 0.5 * lod) * y[app, lod] for app, lod in y.keys()), GRB.MAXIMIZE)
+    m1.optimize(packable)
+
+    selected_apps = []
+    if m1.SolCount > 0:
+        selected_apps = [(app, lod) for app, lod in itertools.product(app_ids, range(lods)) if y[app, lod].X > 0.5]
+    m1.dispose()
+    if verbose:
+        print(f"Packing oracle: {oracle.searches} searches, {len(cuts)} lazy cuts")
+        print("selected_apps: ", selected_apps)
+    return selected_apps
+
+
+def solve_two_stage(info, app_ids, lods=3, weights=None, time_limit=None, coefficients=None, env=None, max_apps=4,
+                    incremental=True, verbose=False):
+    """
+    Places apps with the two-stage optimization of multiStage.py.
+
+    Stage 1 selects apps and LoDs (select_apps()). Stage 2 places them; whenever not all selected apps can be placed,
+    the LoD of the least relevant app with the highest LoD is reduced and Stage 2 is solved again. In incremental mode
+    one Stage-2 model is kept, only the bounds of the reduced app are toggled and the previous placement is used as
+    a warm start.
+
+    Args:
+        info (dict): Scene information as returned by Scene.get_info().
+        app_ids (list of str): Applications that can be placed.
+        lods (int): Number of levels of detail.
+        weights (dict): Stage-2 objective weights, see objective.weighted_objective(); defaults to the Version-3
+            objective of multiStage.py.
+        time_limit (float): Optional time limit in seconds shared by all solves; when it runs out, the placement of
+            the last Stage-2 tryout is returned.
+        coefficients (numpy.ndarray): Stage-2 objective coefficients broadcastable to (apps, lods, columns, rows),
+            used instead of weights.
+        env (gurobipy.Env): Gurobi environment used for the models.
+        max_apps (int): Maximum number of placed applications.
+        incremental (bool): Update one Stage-2 model instead of rebuilding it on every tryout.
+        verbose (bool): Print the progress of both stages.
+
+    Returns:
+        dict: "optimal_results" for UI.init_app(), the statistics of the last Stage-2 solve
+        (PlacementModel.statistics()), "stage1_time", "build_time" and "total_time" in seconds, and "stage2", one
+        report row per Stage-2 tryout with build time, solve time, simplex iterations and nodes.
+    """
+    start = time.perf_counter()
+    remaining = lambda: None if time_limit is None else max(time_limit - (time.perf_counter() - start), 0)
+    relevance = info["relevance"]
+    if verbose:
+        print("--------STAGE-1-------")
+    selected_apps = select_apps(info, app_ids, lods, max_apps, env=env, time_limit=remaining(), verbose=verbose)
+    stage1_time = time.perf_counter() - start
+    if verbose:
+        print("--------STAGE-1 END-------")
+
+    # Version-3: Relevance, LoD Preference, and Interaction Cost
+    objective2 = weighted_objective(info, app_ids, lods, weights) if coefficients is None else coefficients
+
+    stage2_iteration = 0
+    stage2_report = []
+    optimal_results = []
+    placement = None
+    while True:  # Adaptive LoD Reduction Loop
+        if verbose:
+            print("--------STAGE-2: Tryout-", stage2_iteration, " --------")
+        build_start = time.perf_counter()
+        if placement is None or not incremental:
+            if placement is not None:
+                placement.model.dispose()
+            # Constraint 2-1: Place only selected apps (restrict_to), all other constraints see placement_model.py
+            placement = PlacementModel(info, app_ids, lods, name="ui_placement", max_apps=max_apps, env=env)
+            placement.restrict_to(selected_apps)
+            placement.set_objective(objective2, GRB.MAXIMIZE)  # Maximize relevance score
+        if time_limit is not None:
+            placement.model.Params.TimeLimit = remaining()
+        placement.model.update()
+        build_time = time.perf_counter() - build_start
+
+        placement.optimize()
+        if verbose:
+            print("--------STAGE-2 Tryout-", stage2_iteration, " END--------")
+
+        # Check if placement succeeded
+        optimal_results = placement.results()
+        placed_apps = set(result["name"] for result in optimal_results)
+        stage2_report.append({
+            "tryout": stage2_iteration,
+            "build_time": build_time,
+            "solve_time": placement.model.Runtime,
+            "iterations": placement.model.IterCount,
+            "nodes": placement.model.NodeCount,
+            "placed": len(placed_apps),
+            "selected": len(selected_apps)
+        })
+
+        if len(placed_apps) == len(selected_apps):
+            if verbose:
+                print(f"Success: All {len(selected_apps)} apps placed.")
+            break
+        if remaining() == 0:
+            if verbose:
+                print("Time limit reached, stopping optimization.")
+            break
+
+        # Reduce LoD of the least relevant app in selected_apps
+        max_lod = max(lod for _, lod in selected_apps)
+        max_lod_apps = [(app, lod) for app, lod in selected_apps if lod == max_lod]
+        app_to_reduce = min(max_lod_apps, key=lambda app: relevance[app[0]])
+        selected_apps.remove(app_to_reduce)
+        new_lod = app_to_reduce[1] - 1
+        selected_apps.append((app_to_reduce[0], new_lod))
+        if verbose:
+            print("Placement failed!")
+            print(f"Reduced LoD of {app_to_reduce[0]} to {new_lod}")
+        # If all apps are at LoD=0, stop to prevent infinite loops
+        if all(lod == 0 for _, lod in selected_apps):
+            if verbose:
+                print("All apps are at LoD=0, stopping optimization.")
+            break
+
+        # Incremental mode: only toggle the bounds of the reduced app and warm-start from the previous placement,
+        # a smaller LoD anchored at the same slot covers a subset of the cells and is still feasible
+        if incremental:
+            placement.allow(app_to_reduce[0], app_to_reduce[1], False)
+            placement.allow(app_to_reduce[0], new_lod, True)
+            placement.warm_start([dict(result, lod=new_lod) if result["name"] == app_to_reduce[0] else result
+                                  for result in optimal_results])
+
+        stage2_iteration += 1
+
+    result = {"optimal_results": optimal_results, "stage1_time": stage1_time,
+              "build_time": sum(row["build_time"] for row in stage2_report), "stage2": stage2_report}
+    result.update(placement.statistics())
+    placement.model.dispose()
+    result["total_time"] = time.perf_counter() - start
+    return result
+
+
+def print_stage2_report(stage2_report, incremental=True):
+    print("--------STAGE-2 REPORT-------")
+    print(f"Mode: {'incremental' if incremental else 'rebuild'}, tryouts: {len(stage2_report)}")
+    print(f"{'tryout':>6} {'placed':>7} {'build (s)':>10} {'solve (s)':>10} {'simplex it':>11} {'nodes':>6}")
+    for row in stage2_report:
+        print(f"{row['tryout']:>6} {row['placed']:>3}/{row['selected']:<3} {row['build_time']:>10.4f} {row['solve_time']:>10.4f} "
+              f"{row['iterations']:>11.0f} {row['nodes']:>6.0f}")
+    print(f"{'total':>6} {'':>7} {sum(row['build_time'] for row in stage2_report):>10.4f} "
+          f"{sum(row['solve_time'] for row in stage2_report):>10.4f}")
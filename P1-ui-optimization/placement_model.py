@@ -0,0 +1,287 @@
+import numpy as np
+import scipy.sparse as sp
+import gurobipy as gp
+from gurobipy import GRB
+
+from grid import load_footprint_matrix, boundary_mask, restricted_mask, roi_mask
+
+# The placement model builder creates the x[app, lod, xIdx, yIdx] decision variables of main.py and multiStage.py
+# as a single Gurobi MVar tensor and expresses the layout constraints with precomputed NumPy masks and sparse
+# matrices instead of nested Python loops. The masks themselves are built in grid.py.
+
+
+class PlacementModel:
+    """
+    Gurobi placement model for the x[app, lod, xIdx, yIdx] placements of main.py and multiStage.py.
+
+    Placements that are infeasible regardless of the other apps (outside the grid, on the "Apps" button or questions
+    panel, on the ROI) are pruned up front, so x is a single MVar over the remaining candidates only. candidates
+    holds the (app, lod, xIdx, yIdx) indices of each variable and index its position in the dense
+    (apps, lods, columns, rows) tensor; dense() scatters candidate values back into that tensor.
+
+    With prune=False every placement gets a variable and the infeasible ones are fixed to 0 by their upper bounds,
+    with prune_roi=False only the ROI placements are kept that way, so the ROI can be moved by changing bounds
+    (move_roi()).
+
+    The constraints of main.py are added on construction:
+    - at most max_apps elements are placed,
+    - each app is placed at most once with one LoD,
+    - no two placements cover the same grid cell.
+    """
+
+    def __init__(self, info, app_ids, lods, name="ui_optimizer", max_apps=4, env=None, prune=True, prune_roi=True):
+        self.info = info
+        self.app_ids = list(app_ids)
+        self.lods = lods
+        self.cols, self.rows = info["columns"], info["rows"]
+        self.shape = (len(self.app_ids), lods, self.cols, self.rows)
+        num_apps, num_placements = len(self.app_ids), lods * self.cols * self.rows
+        self.num_placements = num_placements
+        self.prune = prune
+        self.prune_roi = prune and prune_roi
+
+        # Precomputed masks, shared by all apps
+        self.footprint = load_footprint_matrix(self.cols, self.rows, lods)
+        self.out_of_bounds = boundary_mask(self.cols, self.rows, lods)
+        self.restricted = restricted_mask(info, lods, self.footprint)
+        self.roi = roi_mask(info, lods)
+        self.forbidden = self.out_of_bounds | self.restricted | self.roi
+
+        # Candidate generation: only placements that are not pruned get a variable
+        pruned = np.zeros((lods, self.cols, self.rows), dtype=bool)
+        if prune:
+            pruned = self.forbidden if prune_roi else self.out_of_bounds | self.restricted
+        placements = np.flatnonzero(~pruned)
+        self.index = (np.arange(num_apps)[:, None] * num_placements + placements[None, :]).ravel()
+        self.candidates = np.stack(np.unravel_index(self.index, self.shape), axis=1)
+        self.num_candidates = len(self.index)
+
+        self.model = gp.Model(name, env=env)
+        self.x = self.model.addMVar(self.num_candidates, vtype=GRB.BINARY, name="x")
+
+        # Constraint 1: Max elements placed
+        self.model.addConstr(self.x.sum() <= max_apps, name="max_apps")
+
+        # Constraint 2: Each app is placed at most once with one LoD
+        once = sp.csr_matrix((np.ones(self.num_candidates), (self.candidates[:, 0], np.arange(self.num_candidates))),
+                             shape=(num_apps, self.num_candidates))
+        self.model.addConstr(once @ self.x <= 1, name="once")
+
+        # Constraint 3: Prevent overlapping between apps, one row of the footprint matrix per grid cell
+        occupancy = self.footprint[:, self.index % num_placements]
+        self.model.addConstr(occupancy @ self.x <= 1, name="occupied")
+
+        # Constraint 4: Fix the remaining placements outside the grid, on restricted areas and on the ROI to 0
+        # allowed tracks the feasibility of each candidate, selected the (app, lod) pairs that may be placed
+        self.allowed = ~self.forbidden.ravel()[self.index % num_placements]
+        self.selected = np.ones(self.num_candidates, dtype=bool)
+        self.ub = self.allowed.astype(float)
+        self.x.UB = self.ub
+
+    def strengthen(self, coefficients, capacity=True, symmetry=True):
+        """
+        Adds optional cuts that tighten the LP relaxation and break symmetry, the optimal objective is unchanged.
+
+        The per-cell clique cuts are the "occupied" rows already: placements that pairwise overlap share a grid cell
+        (Helly property of rectangles), so every maximal clique of conflicting placements is one row.
+
+        - capacity: the placed footprints cover at most the cells that an allowed placement can cover. The row is
+          the sum of the "occupied" rows, but as one knapsack row Gurobi derives cover cuts from it. The Stage-1
+          estimate of multiStage.py is not used, it is not a valid bound.
+        - symmetry: apps with the same objective coefficients (e.g. equal relevance) are interchangeable, so they
+          are placed in order: the earlier app is placed if the later one is, and at a lower candidate position.
+
+        The cuts hold for the current upper bounds and the given coefficients only, so they do not combine with
+        restrict_to(), allow(), move_roi(), set_scene() or a replaced objective.
+
+        Args:
+            coefficients (numpy.ndarray): The objective coefficients, broadcastable to (apps, lods, columns, rows).
+            capacity (bool): Add the capacity cut.
+            symmetry (bool): Add the ordering constraints.
+
+        Returns:
+            int: Number of added constraints.
+        """
+        added = 0
+        if capacity:
+            area = np.asarray(self.footprint.sum(axis=0)).ravel()[self.index % self.num_placements]
+            coverable = self.footprint[:, np.flatnonzero(~self.forbidden.ravel())].getnnz(axis=1) > 0
+            self.model.addConstr(area @ self.x <= int(coverable.sum()), name="capacity")
+            added += 1
+        if symmetry:
+            # Every app has the same candidate placements, in the same order
+            num_apps = len(self.app_ids)
+            per_app = self.num_candidates // num_apps
+            x = self.x.reshape(num_apps, per_app)
+            values = self.candidate_values(coefficients).reshape(num_apps, per_app)
+            position = np.arange(1, per_app + 1)
+            _, groups = np.unique(values, axis=0, return_inverse=True)
+            for group in np.unique(groups):
+                apps = np.flatnonzero(groups == group)
+                for first, second in zip(apps[:-1], apps[1:]):
+                    self.model.addConstr(x[first].sum() >= x[second].sum(), name=f"order_used[{first}]")
+                    self.model.addConstr(position @ x[first] <= position @ x[second] + per_app * (1 - x[second].sum()),
+                                         name=f"order_position[{first}]")
+                    added += 2
+        return added
+
+    def dense(self, values, fill=0):
+        """Scatters per-candidate values into a dense (apps, lods, columns, rows) array."""
+        out = np.full(int(np.prod(self.shape)), fill, dtype=np.asarray(values).dtype)
+        out[self.index] = values
+        return out.reshape(self.shape)
+
+    def candidate_values(self, values):
+        """Gathers the per-candidate entries of an array broadcastable to (apps, lods, columns, rows)."""
+        return np.broadcast_to(values, self.shape).reshape(-1)[self.index]
+
+    def restrict_to(self, selected_apps):
+        """Only allows the given (app, lod) pairs to be placed; all other variables are fixed to 0."""
+        selected = np.zeros((len(self.app_ids), self.lods), dtype=bool)
+        for app, lod in selected_apps:
+            selected[self.app_ids.index(app), lod] = True
+        self.selected = selected[self.candidates[:, 0], self.candidates[:, 1]]
+        self.ub = (self.selected & self.allowed).astype(float)
+        self.x.UB = self.ub
+
+    def allow(self, app, lod, allowed=True):
+        """Toggles the upper bounds of the x[app, lod, :, :] variables without touching the rest of the model."""
+        a = self.app_ids.index(app)
+        affected = np.flatnonzero((self.candidates[:, 0] == a) & (self.candidates[:, 1] == lod))
+        self.selected[affected] = allowed
+        self.ub[affected] = self.allowed[affected] & allowed
+        self.x[affected].UB = self.ub[affected]
+
+    def move_roi(self, roi_pos, roi_rad):
+        """
+        Moves the ROI by only updating the upper bounds of the placements whose overlap with the ROI changed.
+
+        Needs a model built with prune=False or prune_roi=False, so every placement near the ROI has a variable.
+
+        Returns:
+            int: Number of variables whose bounds changed.
+        """
+        if self.prune_roi:
+            raise ValueError("move_roi() needs a model built with prune_roi=False")
+        self.info = dict(self.info, roi_pos=roi_pos, roi_rad=roi_rad)
+        self.roi = roi_mask(self.info, self.lods)
+        self.forbidden = self.out_of_bounds | self.restricted | self.roi
+        allowed = ~self.forbidden.ravel()[self.index % self.num_placements]
+        changed = np.flatnonzero(allowed != self.allowed)
+        self.allowed = allowed
+        self.ub[changed] = allowed[changed] & self.selected[changed]
+        self.x[changed].UB = self.ub[changed]
+        return len(changed)
+
+    def set_scene(self, info, app_ids):
+        """
+        Reuses the model for another scene with the same grid size and number of apps, e.g. as a warm template of
+        service.py: the masks of the "Apps" button, the questions panel and the ROI are recomputed and applied as
+        upper bounds, all (app, lod) pairs are selected again. The objective has to be replaced as well.
+
+        Needs a model built with prune=False, so every placement has a variable.
+        """
+        if self.prune:
+            raise ValueError("set_scene() needs a model built with prune=False")
+        if (info["columns"], info["rows"], len(app_ids)) != (self.cols, self.rows, self.shape[0]):
+            raise ValueError("set_scene() needs the same grid size and number of apps")
+        self.info = info
+        self.app_ids = list(app_ids)
+        self.restricted = restricted_mask(info, self.lods, self.footprint)
+        self.roi = roi_mask(info, self.lods)
+        self.forbidden = self.out_of_bounds | self.restricted | self.roi
+        self.allowed = ~self.forbidden.ravel()[self.index % self.num_placements]
+        self.selected[:] = True
+        self.ub = self.allowed.astype(float)
+        self.x.UB = self.ub
+
+    def warm_start(self, optimal_results):
+        """
+        Sets the MIP start of every variable from a list of placements in the optimal_results format.
+
+        Placements that are pruned or not allowed by the current upper bounds are dropped from the start.
+        """
+        start = np.zeros(self.shape)
+        for result in optimal_results:
+            a, (xIdx, yIdx) = self.app_ids.index(result["name"]), result["placement"]
+            start[a, result["lod"], xIdx, yIdx] = 1
+        self.x.Start = np.minimum(self.candidate_values(start), self.ub)
+
+    def allow_roi(self):
+        """Allows placements on the ROI again (bounds only), so occluding the ROI can be penalized instead."""
+        self.allowed = ~(self.out_of_bounds | self.restricted).ravel()[self.index % self.num_placements]
+        self.ub = (self.selected & self.allowed).astype(float)
+        self.x.UB = self.ub
+
+    def set_objective(self, coefficients, sense=GRB.MAXIMIZE):
+        """Sets a linear objective from a coefficient array broadcastable to (apps, lods, columns, rows)."""
+        self.model.ModelSense = sense
+        self.model.setObjective(self.candidate_values(coefficients) @ self.x)
+
+    def update_objective(self, coefficients):
+        """Replaces the objective coefficients in place, the model and its last solution are kept for the next solve."""
+        self.x.Obj = self.candidate_values(coefficients)
+
+    def set_objectives(self, objectives, sense=GRB.MAXIMIZE):
+        """
+        Sets a hierarchical multi-objective, optimized by decreasing priority.
+
+        Args:
+            objectives (list of tuple[numpy.ndarray, int]): Coefficient arrays broadcastable to
+                (apps, lods, columns, rows) and their priorities.
+            sense (int): GRB.MAXIMIZE or GRB.MINIMIZE, shared by all objectives.
+        """
+        self.model.ModelSense = sense
+        for i, (coefficients, priority) in enumerate(objectives):
+            self.model.setObjectiveN(self.candidate_values(coefficients) @ self.x, i, priority=priority)
+
+    def update_objectives(self, objectives):
+        """Replaces the coefficients of the objectives set by set_objectives() in place."""
+        for i, coefficients in enumerate(objectives):
+            self.model.Params.ObjNumber = i
+            self.x.ObjN = self.candidate_values(coefficients)
+
+    def optimize(self):
+        self.model.update()
+        self.model.optimize()
+
+    def statistics(self):
+        """
+        Returns the size of the model and the statistics of the last solve.
+
+        Returns:
+            dict: status, objective, bound and relative gap (None without a solution), solve time in seconds,
+            branch-and-bound nodes, simplex iterations and the number of variables and constraints.
+        """
+        model = self.model
+        solved = model.SolCount > 0
+        return {
+            "status": model.Status,
+            "objective": model.ObjVal if solved else None,
+            "bound": model.ObjBound if solved else None,
+            "gap": model.MIPGap if solved else None,
+            "solve_time": model.Runtime,
+            "nodes": model.NodeCount,
+            "iterations": model.IterCount,
+            "variables": model.NumVars,
+            "constraints": model.NumConstrs
+        }
+
+    def results(self):
+        """
+        Extracts the placed applications from the solved model.
+
+        Returns:
+            list of dict: optimal_results in the format expected by UI.init_app(), empty if no solution was found,
+            e.g. when the time limit was hit first.
+        """
+        optimal_results = []
+        if self.model.SolCount == 0:
+            return optimal_results
+        for a, lod, xIdx, yIdx in self.candidates[self.x.X > 0.5]:
+            optimal_results.append({
+                "name": self.app_ids[a],
+                "lod": int(lod),
+                "placement": [int(xIdx), int(yIdx)]
+            })
+        return optimal_results
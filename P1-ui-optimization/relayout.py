@@ -0,0 +1,175 @@
+import argparse
+import math
+import queue
+import random
+import sys
+import threading
+import time
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from scene import Scene
+from heuristic import HeuristicPlacer
+from objective import interaction_objective, layout_objective
+from placement_model import PlacementModel
+
+# Streaming re-layout for a moving Region of Interest (ROI). One placement model keeps a variable for every placement
+# near the ROI (prune_roi=False); an ROI update only changes the upper bounds of the placements whose overlap changed
+# and re-solves warm-started from the previous layout. When the solve does not finish within its share of the latency
+# budget, the heuristic (heuristic.py) is used instead. The layouts can be pushed into an open UI window.
+#
+#   python relayout.py scenes/scene-1.json --headless --updates 200   # latency report without a window
+#   python relayout.py scenes/scene-1.json --rate 20                  # ROI moving on a path in a live window
+
+# Share of the latency budget given to the ILP, the rest is left for the heuristic fallback
+ILP_SHARE = 0.6
+
+
+class StreamingRelayout:
+    """
+    Re-solves the placement for a stream of ROI updates.
+
+    Args:
+        info (dict): Scene information as returned by UI.get_info().
+        app_ids (list of str): Applications that can be placed.
+        lods (int): Number of levels of detail.
+        coefficients (numpy.ndarray): Objective coefficients broadcastable to (apps, lods, columns, rows);
+            defaults to the Version-3 objective of main.py. The objective does not depend on the ROI.
+        budget (float): Latency budget per update in seconds.
+        max_apps (int): Maximum number of placed applications.
+        env (gurobipy.Env): Gurobi environment used for the model.
+    """
+
+    def __init__(self, info, app_ids, lods, coefficients=None, budget=0.05, max_apps=4, env=None):
+        self.app_ids = list(app_ids)
+        self.coefficients = interaction_objective(info, self.app_ids, lods) if coefficients is None else coefficients
+        self.budget = budget
+        self.placement = PlacementModel(info, self.app_ids, lods, name="ui_relayout", max_apps=max_apps, env=env,
+                                        prune_roi=False)
+        self.placement.set_objective(self.coefficients, GRB.MAXIMIZE)
+        self.placer = HeuristicPlacer(info, self.app_ids, lods, self.coefficients, max_apps, self.placement.forbidden)
+        self.optimal_results = []
+
+    def update(self, roi_pos, roi_rad):
+        """
+        Moves the ROI and returns the new layout.
+
+        Returns:
+            tuple[list of dict, dict]: optimal_results for UI.init_app() and statistics with the latency in seconds,
+            the source of the layout ("ilp", "ilp-incumbent" or "heuristic") and the number of changed bounds.
+        """
+        start = time.perf_counter()
+        changed = self.placement.move_roi(np.asarray(roi_pos), roi_rad)
+        # Apps of the previous layout that now overlap the ROI are dropped from the start by their bounds
+        self.placement.warm_start(self.optimal_results)
+        self.placement.model.Params.TimeLimit = max(self.budget * ILP_SHARE - (time.perf_counter() - start), 1e-3)
+        self.placement.optimize()
+
+        model = self.placement.model
+        if model.Status == GRB.OPTIMAL:
+            optimal_results, source = self.placement.results(), "ilp"
+        else:
+            self.placer.set_forbidden(self.placement.forbidden)
+            optimal_results, source = self.placer.solve(), "heuristic"
+            if model.SolCount > 0:
+                incumbent = self.placement.results()
+                if layout_objective(self.coefficients, self.app_ids, incumbent) > self.placer.objective_value:
+                    optimal_results, source = incumbent, "ilp-incumbent"
+
+        self.optimal_results = optimal_results
+        return optimal_results, {"latency": time.perf_counter() - start, "source": source, "changed": changed}
+
+    def stream(self, updates):
+        """Yields (optimal_results, statistics) for an iterable of (roi_pos, roi_rad) updates."""
+        for roi_pos, roi_rad in updates:
+            yield self.update(roi_pos, roi_rad)
+
+
+def roi_path(info, updates, rate=None, radius=None):
+    """
+    Yields ROI updates that move the ROI on a Lissajous path across the window, paced at rate Hz if given.
+
+    With several ROIs (info["roi_rad"] of shape (n,)), each one moves on the same path with its own phase and the
+    updates hold (n, 2) positions and (n,) radii.
+    """
+    width, height = info["columns"] * info["block_size"], info["rows"] * info["block_size"]
+    radius = info["roi_rad"] if radius is None else radius
+    radii = np.atleast_1d(radius)
+    phases = 2 * math.pi * np.arange(len(radii)) / len(radii)
+    for i in range(updates):
+        if rate:
+            time.sleep(1 / rate)
+        t = 2 * math.pi * i / max(updates, 1) + phases
+        roi_pos = np.stack([width / 2 + (width / 2 - radii) * np.sin(3 * t),
+                            height / 2 + (height / 2 - radii) * np.sin(2 * t)], axis=1).astype(int)
+        yield (roi_pos[0], radius) if np.ndim(radius) == 0 else (roi_pos, radius)
+
+
+def run_live(scene_UI, relayout, updates, poll_ms=10):
+    """
+    Solves the ROI updates in a background thread and pushes the layouts into the open window of scene_UI.
+
+    Tk is not thread-safe, so the layouts are passed through a queue that the Tk main loop polls; when the window
+    falls behind, only the latest layout is applied.
+    """
+    layouts = queue.Queue()
+
+    def solve():
+        for roi_pos, roi_rad in updates:
+            optimal_results, _ = relayout.update(roi_pos, roi_rad)
+            layouts.put((roi_pos, roi_rad, optimal_results))
+
+    def poll():
+        latest = None
+        while not layouts.empty():
+            latest = layouts.get_nowait()
+        if latest is not None:
+            roi_pos, roi_rad, optimal_results = latest
+            scene_UI.update_poi(roi_pos, roi_rad)
+            scene_UI.apply_layout(optimal_results)
+        scene_UI.root.after(poll_ms, poll)
+
+    threading.Thread(target=solve, daemon=True).start()
+    poll()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-layout the UI while the ROI moves.")
+    parser.add_argument("scene_path", nargs="?", default="scenes/scene-1.json")
+    parser.add_argument("--updates", type=int, default=200, help="Number of ROI updates.")
+    parser.add_argument("--rate", type=float, default=20, help="ROI updates per second.")
+    parser.add_argument("--budget", type=float, default=0.05, help="Latency budget per update in seconds.")
+    parser.add_argument("--headless", action="store_true", help="Only report the latencies, do not open a window.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random POI and questions panel positions.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    try:
+        scene = Scene(args.scene_path)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Could not load the scene: {error}")
+    app_ids = list(scene.apps.keys())
+    info = scene.get_info()
+    env = gp.Env(params={"OutputFlag": 0, "Threads": 1})
+    relayout = StreamingRelayout(info, app_ids, scene.LODS, budget=args.budget, env=env)
+    optimal_results, _ = relayout.update(info["roi_pos"], info["roi_rad"])
+
+    if args.headless:
+        stats = [stat for _, stat in relayout.stream(roi_path(info, args.updates))]
+        latencies = np.array([stat["latency"] for stat in stats]) * 1000
+        sources = [stat["source"] for stat in stats]
+        print(f"Updates: {len(stats)}, budget: {args.budget * 1000:.0f} ms, "
+              f"within budget: {np.mean(latencies <= args.budget * 1000):.1%}")
+        print(f"Latency (ms): p50 {np.percentile(latencies, 50):.1f}, p95 {np.percentile(latencies, 95):.1f}, "
+              f"p99 {np.percentile(latencies, 99):.1f}, max {latencies.max():.1f}")
+        print("Sources: " + ", ".join(f"{source} {sources.count(source)}" for source in sorted(set(sources))))
+        return
+
+    from ui import UI
+    scene_UI = UI(scene=scene)
+    scene_UI.init_app(optimal_results, on_start=lambda ui: run_live(ui, relayout, roi_path(info, args.updates, args.rate)))
+
+
+if __name__ == "__main__":
+    main()
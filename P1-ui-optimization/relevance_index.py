@@ -0,0 +1,157 @@
+import argparse
+import glob
+import json
+import os
+import numpy as np
+
+# Relevance index over a corpus of scenes: question counts per (scene, app, lod) are counted once and stored as arrays,
+# so loading a scene looks its relevance up instead of recounting the questions. The counts also give the LoD demand
+# of each app, i.e. which LoD its questions need, which the optimizers can use instead of the fixed (1 + lod) weight.
+# Each entry stores the modification time and size of the scene file and its apps file, so checking whether an entry
+# is current takes two os.stat() calls; entries of edited scenes are treated as missing.
+#
+#   python relevance_index.py scenes/scene-*.json --output .cache/relevance_index.npz
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "relevance_index.npz")
+
+
+def scene_id(path):
+    return os.path.abspath(path)
+
+
+def file_stamp(path):
+    """Returns the modification time in nanoseconds and the size of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class RelevanceIndex:
+    """
+    Question counts of a corpus of scenes.
+
+    Args:
+        scene_ids (list of str): Scene files, as returned by scene_id().
+        app_ids (list of str): All apps of the corpus.
+        counts (numpy.ndarray): Question counts of shape (scenes, apps, lods).
+        available (numpy.ndarray): Boolean mask of shape (scenes, apps), True if the app belongs to the scene.
+        app_paths (list of str): Absolute path of the apps file of each scene.
+        stamps (numpy.ndarray): file_stamp() of the scene file and its apps file when each scene was indexed, shape
+            (scenes, 4); None for an index whose entries are never current.
+    """
+
+    def __init__(self, scene_ids, app_ids, counts, available, app_paths=None, stamps=None):
+        self.scene_ids = list(scene_ids)
+        self.app_paths = list(app_paths) if app_paths is not None else [""] * len(self.scene_ids)
+        self.stamps = np.asarray(stamps, dtype=np.int64) if stamps is not None else np.full((len(self.scene_ids), 4), -1)
+        self.app_ids = list(app_ids)
+        self.counts = counts
+        self.available = available
+        self.scene_index = {scene: i for i, scene in enumerate(self.scene_ids)}
+        self.app_index = {app: i for i, app in enumerate(self.app_ids)}
+
+        # Bonus-1 relevance of ui.py: questions per app divided by the maximum of the scene
+        app_counts = counts.sum(axis=2)
+        max_counts = app_counts.max(axis=1, keepdims=True)
+        self.relevance = np.divide(app_counts, max_counts, out=np.zeros(app_counts.shape), where=max_counts > 0)
+        # Share of the questions of an app that ask for each LoD, and that a LoD can answer (its own and lower ones)
+        self.lod_demand = np.divide(counts, app_counts[:, :, None], out=np.zeros(counts.shape), where=app_counts[:, :, None] > 0)
+        self.lod_coverage = np.cumsum(self.lod_demand, axis=2)
+
+    @classmethod
+    def build(cls, scene_paths, lods=3):
+        """Counts the questions of all scenes in one pass."""
+        scene_ids, app_ids, app_index, app_paths, stamps = [], [], {}, [], []
+        scene_apps, entries = [], []
+        for s, path in enumerate(scene_paths):
+            # Stamped before reading, so an edit while the scene is read leaves the entry outdated
+            scene_stamp = file_stamp(path)
+            with open(path, "r") as file:
+                scene = json.load(file)
+            app_path = os.path.abspath(scene["app_path"])
+            app_stamp = file_stamp(app_path)
+            with open(app_path, "r") as file:
+                apps = [entry["app"] for entry in json.load(file)]
+            for app in apps:
+                app_index.setdefault(app, len(app_index))
+            scene_ids.append(scene_id(path))
+            app_paths.append(app_path)
+            stamps.append(scene_stamp + app_stamp)
+            scene_apps.append([app_index[app] for app in apps])
+            entries.extend((s, app_index[question["app"]], question["lod"]) for question in scene["questions"]
+                           if question["app"] in apps)
+        app_ids = sorted(app_index, key=app_index.get)
+
+        counts = np.zeros((len(scene_ids), len(app_ids), lods), dtype=np.int64)
+        if entries:
+            s, a, lod = np.array(entries).T
+            np.add.at(counts, (s, a, lod), 1)
+        available = np.zeros((len(scene_ids), len(app_ids)), dtype=bool)
+        for s, apps in enumerate(scene_apps):
+            available[s, apps] = True
+        return cls(scene_ids, app_ids, counts, available, app_paths, stamps)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """
+        Loads an index written by save(); indexes without stamps load with all entries outdated.
+
+        Raises:
+            FileNotFoundError: If there is no index file at path.
+        """
+        with np.load(path) as data:
+            if "stamps" in data.files:
+                app_paths, stamps = data["app_paths"].tolist(), data["stamps"]
+            else:
+                app_paths, stamps = None, None
+            return cls(data["scene_ids"].tolist(), data["app_ids"].tolist(), data["counts"], data["available"],
+                       app_paths, stamps)
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, scene_ids=np.array(self.scene_ids), app_ids=np.array(self.app_ids),
+                 counts=self.counts, available=self.available, app_paths=np.array(self.app_paths), stamps=self.stamps)
+
+    def __contains__(self, path):
+        """True if the scene is indexed and neither it nor its apps file changed since, by modification time and size."""
+        s = self.scene_index.get(scene_id(path))
+        if s is None:
+            return False
+        scene_stamp, app_stamp = file_stamp(path), file_stamp(self.app_paths[s])
+        return scene_stamp is not None and app_stamp is not None and self.stamps[s].tolist() == scene_stamp + app_stamp
+
+    def scene_relevance(self, path):
+        """Returns the relevance of the apps of a scene, as computed by Scene.calculate_relevance()."""
+        s = self.scene_index[scene_id(path)]
+        return {self.app_ids[a]: float(self.relevance[s, a]) for a in np.flatnonzero(self.available[s])}
+
+    def lod_weights(self, path, app_ids, lods):
+        """
+        LoD weights from the questions of a scene, to replace the (1 + lod) weight of the objective.
+
+        A LoD answers the questions that ask for it or a lower LoD. The weight grows from 1 to lods with the share of
+        the questions of the app that a LoD answers, so a larger footprint is only preferred when questions need it.
+
+        Returns:
+            numpy.ndarray: Weights of shape (len(app_ids), lods).
+        """
+        s = self.scene_index[scene_id(path)]
+        coverage = self.lod_coverage[s, [self.app_index[app] for app in app_ids], :lods]
+        return 1 + (lods - 1) * coverage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the relevance index of a corpus of scenes.")
+    parser.add_argument("scenes", nargs="*", default=sorted(glob.glob("scenes/scene-*.json")))
+    parser.add_argument("--output", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args()
+
+    index = RelevanceIndex.build(args.scenes)
+    index.save(args.output)
+    print(f"Indexed {len(index.scene_ids)} scenes, {len(index.app_ids)} apps, {int(index.counts.sum())} questions: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from grid import lod_size
+
+# Persistent cache of optimal_results keyed by a hash of the resolved optimizer inputs. UI.load_scene randomizes the
+# POI and questions panel when a scene does not fix them, so the key is computed from UI.get_info() after loading
+# rather than from the scene file. Entries are JSON files; the least recently used ones are evicted.
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results")
+
+# Bump when the optimizer output changes for the same inputs, so old entries are no longer hit
+CACHE_VERSION = 2
+
+
+def _normalize(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 9)
+    return value
+
+
+def scene_key(info, app_ids, lods, formulation, weights=None, options=None):
+    """
+    Hashes everything the optimizer result depends on.
+
+    Args:
+        info (dict): Scene information as returned by UI.get_info().
+        app_ids (list of str): Applications that can be placed, in model order.
+        lods (int): Number of levels of detail.
+        formulation (str): Optimizer used, e.g. "single-stage", "two-stage" or "heuristic".
+        weights (dict): Objective weights, e.g. {"lambda_weight": 0.1}.
+        options (dict): Other optimizer options that may change the layout, e.g. {"strengthen": True}.
+
+    Returns:
+        str: Hex digest used as the cache key.
+    """
+    inputs = {
+        "version": CACHE_VERSION,
+        "formulation": formulation,
+        "grid": [info["columns"], info["rows"], info["block_size"]],
+        "questions": [info["questions_pos"], info["questions_size"]],
+        "btn_all": [info["btn_all_pos"], info["btn_all_size"]],
+        "roi": [info["roi_pos"], info["roi_rad"]],
+        "apps": list(app_ids),
+        "relevance": [float(info["relevance"][app]) for app in app_ids],
+        "lod_sizes": [lod_size(lod) for lod in range(lods)],
+        "weights": weights or {}
+    }
+    # Only added when set, so the keys of earlier entries stay valid
+    if options:
+        inputs["options"] = options
+    payload = json.dumps(_normalize(inputs), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk LRU cache of optimal_results.
+
+    Args:
+        cache_dir (str): Directory of the cache entries.
+        max_entries (int): Maximum number of entries, the least recently used ones are removed beyond it.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returns the cached optimal_results for key, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(path, "r") as file:
+                optimal_results = json.load(file)["optimal_results"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+        # The modification time tracks the last use for the LRU eviction
+        os.utime(path)
+        return optimal_results
+
+    def put(self, key, optimal_results):
+        """Stores optimal_results under key and evicts the least recently used entries."""
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"optimal_results": optimal_results}, file)
+        # Atomic on POSIX and Windows, concurrent writers of the same key cannot leave a partial file
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
@@ -0,0 +1,194 @@
+import json
+import numpy as np
+import random
+
+from app import create_apps, load_apps
+from geometry import grid_circle_overlap
+
+# Headless scene model: parses scene-N.json and its apps-N.json and provides get_info() for the optimizers without
+# importing tkinter or PIL, so optimization can start quickly and run on servers without a display. ui.UI extends it
+# with the window; UI(scene=scene) opens a window for an already loaded scene.
+#
+# Missing POI and questions panel positions and the app contents are random. With a seed (the seed argument, the
+# "seed" key of the scene file, e.g. from generate_scenes.py, or a default_seed for files without one) they come from a
+# private generator, so the seed fully reproduces the scene. Scene files may also set the grid size
+# ("grid": [columns, rows]) and several POIs ("poi_pos": [[x, y], ...], "poi_size": [r, ...]); the window of ui.py
+# only shows 8 x 6 grids.
+
+
+class Scene:
+    LODS = 3
+    WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
+    BLOCK_SIZE = 100
+    COLS, ROWS = 8, 6
+    QUESTIONS_WIDTH, QUESTIONS_HEIGHT = 200, 200
+    BTN_ALL_POS = [10, 10]
+    BTN_ALL_WIDTH, BTN_ALL_HEIGHT = 80, 80
+    POI_RADIUS_MIN, POI_RADIUS_MAX = 50, 200
+    POI_PLACEMENT_PADDING = 100
+
+    __slots__ = ("scene_path", "apps", "env_path", "poi_pos", "poi_size", "q_pos", "relevance", "questions",
+                 "columns", "rows", "rng")
+
+    def __init__(self, path="scene.json", shuffle_questions=True, relevance_index=None, seed=None, default_seed=None):
+        self.load_scene(path, shuffle_questions, relevance_index, seed, default_seed)
+
+    # Retrieves key UI-related attributes used for layout, rendering, and optimization.
+    # Returns a dictionary containing:
+    # - "columns" (int): Number of columns in the UI grid.
+    # - "rows" (int): Number of rows in the UI grid.
+    # - "block_size" (int): Size of each block in the grid in pixels.
+    # - "questions_pos" (numpy.ndarray): X and Y position of the question panel in the UI in pixels.
+    # - "questions_size" (numpy.ndarray): Width and height of the question panel in pixels.
+    # - "btn_all_pos" (numpy.ndarray): Position of the "Apps" button to its top left corner in pixels.
+    # - "btn_all_size" (numpy.ndarray): Width and height of the "Apps" button in pixels.
+    # - "roi_pos" (numpy.ndarray): Position of the Region of Interest (ROI) in the UI in pixels, (n, 2) for n ROIs.
+    # - "roi_rad" (int): Radius of the Region of Interest (ROI) in pixels, shape (n,) for n ROIs.
+    # - "relevance" (dict[str, float]): A dictionary mapping application names to their relevance scores.
+    def get_info(self):
+        return {
+            "columns": self.columns,
+            "rows": self.rows,
+            "block_size": self.BLOCK_SIZE,
+            "questions_pos": self.q_pos,
+            "questions_size": np.array([self.QUESTIONS_WIDTH, self.QUESTIONS_HEIGHT]),
+            "btn_all_pos": self.BTN_ALL_POS,
+            "btn_all_size": np.array([self.BTN_ALL_WIDTH, self.BTN_ALL_HEIGHT]),
+            "roi_pos": self.poi_pos,
+            "roi_rad": self.poi_size,
+            "relevance": self.relevance
+        }
+
+    @classmethod
+    def from_dict(cls, scene, path="", shuffle_questions=True, seed=None):
+        """
+        Creates a scene from the contents of a scene-N.json file, e.g. a request of service.py.
+
+        The apps may be given inline as "apps" in the apps-N.json format instead of an "app_path".
+        """
+        self = cls.__new__(cls)
+        self.init_scene(scene, path, shuffle_questions, None, seed)
+        return self
+
+    def load_scene(self, path="scene.json", shuffle_questions=True, relevance_index=None, seed=None, default_seed=None):
+        """
+        Loads a scene-N.json file and its apps.
+
+        Raises:
+            FileNotFoundError: If the scene or apps file does not exist.
+            ValueError: If the scene or apps file is not valid JSON or the scene is incomplete, see init_scene().
+        """
+        try:
+            with open(path, 'r') as file:
+                scene = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Error decoding JSON from file: {path}") from error
+        self.init_scene(scene, path, shuffle_questions, relevance_index, seed, default_seed)
+
+    def init_scene(self, scene, path, shuffle_questions=True, relevance_index=None, seed=None, default_seed=None):
+        """
+        Initializes the scene from the contents of a scene-N.json file.
+
+        Raises:
+            ValueError: If "questions", "relevance" or the apps ("app_path" or inline "apps") are missing, or a
+                question refers to an unknown app.
+        """
+        if not isinstance(scene, dict):
+            raise ValueError(f"Expected a JSON object in scene: {path}")
+        missing = [key for key in ("questions", "relevance") if key not in scene]
+        if "apps" not in scene and "app_path" not in scene:
+            missing.append("app_path")
+        if missing:
+            raise ValueError(f"Missing {', '.join(missing)} in scene: {path}")
+        self.scene_path = path
+        # The seed argument overrides the seed of the scene file, default_seed is only used when neither is given
+        if seed is None:
+            seed = scene.get("seed", default_seed)
+        self.rng = random if seed is None else random.Random(seed)
+        self.columns, self.rows = scene.get("grid", [self.COLS, self.ROWS])
+        if "apps" in scene:
+            self.apps = create_apps(scene["apps"], np.random.default_rng(self.rng.getrandbits(64)))
+        else:
+            self.apps = self.load_apps(scene["app_path"])
+        self.env_path = scene.get("env_path")
+
+        if "poi_pos" in scene:
+            self.poi_pos = np.array(scene["poi_pos"])
+        else:
+            width, height = self.columns * self.BLOCK_SIZE, self.rows * self.BLOCK_SIZE
+            self.poi_pos = np.array([
+                self.rng.randint(self.POI_PLACEMENT_PADDING, width - self.POI_PLACEMENT_PADDING),
+                self.rng.randint(self.POI_PLACEMENT_PADDING, height - self.POI_PLACEMENT_PADDING)
+            ])
+        if "poi_size" in scene:
+            poi_size = scene["poi_size"]
+            self.poi_size = np.array(poi_size) if isinstance(poi_size, list) else poi_size
+        else:
+            self.poi_size = self.rng.randint(self.POI_RADIUS_MIN, self.POI_RADIUS_MAX)
+
+        if "q_pos" in scene:
+            self.q_pos = np.array(scene["q_pos"])
+        else:
+            valid_placements = self.get_valid_question_placements()
+            self.q_pos = self.BLOCK_SIZE * np.array(valid_placements[
+                self.rng.randint(0, len(valid_placements) - 1)
+            ])
+            #self.q_pos = self.BLOCK_SIZE * np.array([
+            #    random.randint(0,self.COLS - 2),
+            #    random.randint(0,self.ROWS - 2)
+            #])
+
+        self.init_relevance(scene["relevance"])
+        self.questions = self.load_questions(scene["questions"])
+        # Look the relevance up in a prebuilt corpus index (see relevance_index.py) instead of recounting
+        if relevance_index is not None and path in relevance_index:
+            self.relevance = relevance_index.scene_relevance(path)
+        else:
+            self.calculate_relevance()
+
+        if shuffle_questions:
+            self.rng.shuffle(self.questions)
+
+    def load_questions(self, questions):
+        num_questions = len(questions)
+        unknown = sorted(set(question["app"] for question in questions) - set(self.apps))
+        if unknown:
+            raise ValueError(f"Questions refer to unknown apps {unknown} in scene: {self.scene_path}")
+        for qi in range(num_questions):
+            app = self.apps[questions[qi]["app"]]
+            a = app.info[questions[qi]["lod"]]
+            questions[qi]["a"] = a
+        return questions
+
+    def load_apps(self, path="apps.json"):
+        try:
+            return load_apps(path, np.random.default_rng(self.rng.getrandbits(64)))
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Error decoding JSON from file: {path}") from error
+
+    def init_relevance(self, relevance):
+        self.relevance = relevance
+        for app in self.apps.keys():
+            if app not in self.relevance:
+                self.relevance[app] = 0.0
+
+# Bonus-1: Automatically calculate relevance
+    def calculate_relevance(self):
+        """
+        Dynamically calculates relevance scores based on scene questions and apps.
+        Apps that appear in more questions get higher relevance scores.
+        """
+        question_counts = {app: 0 for app in self.apps.keys()}
+        for question in self.questions:
+            if question["app"] in question_counts:
+                question_counts[question["app"]] += 1
+
+        max_count = max(question_counts.values(), default=1)
+        self.relevance = {app: count / max_count for app, count in question_counts.items()}
+
+    def get_valid_question_placements(self):
+        # The 2 x 2 question panel must not overlap the points of interest or the "All Apps" button at position [0,0]
+        overlap = grid_circle_overlap(self.poi_pos, self.poi_size, [(2, 2)], self.BLOCK_SIZE,
+                                      self.columns - 2, self.rows - 2).any(axis=0)[0]
+        overlap[0, 0] = True
+        return [[int(xIdx), int(yIdx)] for xIdx, yIdx in np.argwhere(~overlap)]
@@ -0,0 +1,404 @@
+import argparse
+import collections
+import http.client
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+# Long-running layout service: accepts scenes in the scene-N.json format over localhost HTTP or a UNIX socket and
+# returns optimal_results, so a client (e.g. the UI) can refresh layouts without starting Python, importing gurobipy
+# and building a model per request. A pool of warm worker processes keeps a Gurobi environment and one single-stage
+# model template per grid size and number of apps (PlacementModel.set_scene()). At most workers + queue requests are
+# accepted at a time, further ones are rejected with 503 (backpressure). When a worker crashes, the pool is replaced.
+#
+#   python service.py --port 8765 --workers 4 --grids 8x6 --apps 6
+#   python service.py --socket /tmp/ui_layout.sock
+#
+#   POST /layout   scene-N.json content with optional "apps" (inline apps-N.json), "formulation", "weights",
+#                  "time_limit" and "seed"; returns optimal_results with timing and gap statistics
+#   GET  /stats    request counts (invalid requests answered with 400) and latency percentiles
+#   GET  /health
+
+FORMULATIONS = ["single-stage", "two-stage", "heuristic"]
+WEIGHT_KEYS = {"lambda_weight", "lod_weight", "terms"}
+
+# Gurobi environment and model templates of the worker process, created by init_worker()
+worker_env = None
+worker_templates = {}
+
+
+class InvalidScene(Exception):
+    """The scene of a request cannot be loaded, answered with 400."""
+
+
+def validate_request(payload):
+    """
+    Checks the options of a request before it is queued.
+
+    Raises:
+        ValueError: If the payload is not a scene or an option has the wrong type.
+    """
+    from objective import TERMS
+
+    if not isinstance(payload, dict) or "questions" not in payload:
+        raise ValueError("Expected a scene in the scene-N.json format")
+    if payload.get("formulation", "single-stage") not in FORMULATIONS:
+        raise ValueError(f"Unknown formulation: {payload['formulation']}")
+    weights = payload.get("weights")
+    if weights is not None:
+        if not isinstance(weights, dict) or not set(weights) <= WEIGHT_KEYS:
+            raise ValueError(f"weights must be an object with the keys {sorted(WEIGHT_KEYS)}")
+        lambda_weight = weights.get("lambda_weight", 0.1)
+        if isinstance(lambda_weight, bool) or not isinstance(lambda_weight, (int, float)):
+            raise ValueError("weights.lambda_weight must be a number")
+        terms = weights.get("terms") or []
+        if not isinstance(terms, list) or not set(terms) <= set(TERMS):
+            raise ValueError(f"weights.terms must be a list of {sorted(TERMS)}")
+        lod_weight = weights.get("lod_weight")
+        if lod_weight is not None and not np.issubdtype(np.asarray(lod_weight).dtype, np.number):
+            raise ValueError("weights.lod_weight must be numbers")
+    time_limit = payload.get("time_limit")
+    if time_limit is not None and (isinstance(time_limit, bool) or not isinstance(time_limit, (int, float))
+                                   or time_limit < 0):
+        raise ValueError("time_limit must be a non-negative number")
+    if payload.get("seed") is not None and not isinstance(payload["seed"], (int, str)):
+        raise ValueError("seed must be an integer or a string")
+
+
+def init_worker(threads, templates):
+    """Warms a worker process: imports the optimizers, creates the Gurobi environment and the model templates."""
+    global worker_env
+    import gurobipy as gp
+    from grid import load_footprint_matrix
+    from scene import Scene
+
+    worker_env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+    for columns, rows, num_apps in templates:
+        load_footprint_matrix(columns, rows, Scene.LODS)
+        info = {"columns": columns, "rows": rows, "block_size": Scene.BLOCK_SIZE,
+                "questions_pos": np.zeros(2), "questions_size": np.array([Scene.QUESTIONS_WIDTH, Scene.QUESTIONS_HEIGHT]),
+                "btn_all_pos": Scene.BTN_ALL_POS, "btn_all_size": np.array([Scene.BTN_ALL_WIDTH, Scene.BTN_ALL_HEIGHT]),
+                "roi_pos": np.zeros(2), "roi_rad": 0}
+        model_template(info, [str(a) for a in range(num_apps)], Scene.LODS)
+
+
+def model_template(info, app_ids, lods):
+    """Returns the warm single-stage model of the grid size and number of apps, set to the given scene."""
+    from placement_model import PlacementModel
+
+    key = (info["columns"], info["rows"], len(app_ids), lods)
+    if key not in worker_templates:
+        worker_templates[key] = PlacementModel(info, app_ids, lods, name="ui_service", env=worker_env, prune=False)
+    else:
+        worker_templates[key].set_scene(info, app_ids)
+    return worker_templates[key]
+
+
+def solve_template(info, app_ids, lods, weights=None, time_limit=None):
+    """solve_single_stage() of placement.py on a reused model template, returns the same result dict."""
+    from gurobipy import GRB
+    from objective import weighted_objective
+
+    start = time.perf_counter()
+    placement = model_template(info, app_ids, lods)
+    placement.set_objective(weighted_objective(info, app_ids, lods, weights), GRB.MAXIMIZE)
+    placement.model.Params.TimeLimit = GRB.INFINITY if time_limit is None else time_limit
+    placement.model.update()
+    build_time = time.perf_counter() - start
+
+    placement.optimize()
+    result = {"optimal_results": placement.results(), "build_time": build_time}
+    result.update(placement.statistics())
+    result["total_time"] = time.perf_counter() - start
+    return result
+
+
+def solve_request(payload):
+    """
+    Solves one request in a worker process, returns a JSON-serializable result.
+
+    Raises:
+        InvalidScene: If the scene cannot be loaded, e.g. a missing "app_path" or missing keys.
+    """
+    from scene import Scene
+    from placement import solve_two_stage
+
+    start = time.perf_counter()
+    try:
+        scene = Scene.from_dict(payload, seed=payload.get("seed"))
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        raise InvalidScene(f"Invalid scene: {type(error).__name__}: {error}") from error
+    app_ids = list(scene.apps.keys())
+    info = scene.get_info()
+    formulation = payload.get("formulation", "single-stage")
+    weights, time_limit = payload.get("weights"), payload.get("time_limit")
+
+    if formulation == "single-stage":
+        result = solve_template(info, app_ids, scene.LODS, weights, time_limit)
+    elif formulation == "two-stage":
+        result = solve_two_stage(info, app_ids, scene.LODS, weights, time_limit, env=worker_env)
+    else:
+        from heuristic import heuristic_placement
+        from objective import weighted_objective
+        result = {"optimal_results": heuristic_placement(info, app_ids, scene.LODS,
+                                                         weighted_objective(info, app_ids, scene.LODS, weights))}
+    result.update(formulation=formulation, worker=os.getpid(), worker_time=time.perf_counter() - start)
+    return result
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]).tolist()
+    return {"p50": p50, "p90": p90, "p99": p99, "max": float(np.max(values))}
+
+
+class LayoutService:
+    """
+    Worker pool with admission control and latency statistics.
+
+    Args:
+        workers (int): Number of worker processes.
+        threads (int): Gurobi threads per worker.
+        queue (int): Requests that may wait for a worker; beyond workers + queue, requests are rejected.
+        templates (list of tuple[int, int, int]): (columns, rows, apps) model templates built when a worker starts.
+        window (int): Number of recent requests the latency percentiles are computed over.
+    """
+
+    def __init__(self, workers=4, threads=1, queue=16, templates=(), window=10000):
+        self.workers = workers
+        self.initargs = (threads, list(templates))
+        self.executor = self.start_pool()
+        self.pool_lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.lock = threading.Lock()
+        self.latencies = collections.deque(maxlen=window)
+        self.queue_times = collections.deque(maxlen=window)
+        self.counts = collections.Counter()
+        self.pending = 0
+
+    def start_pool(self):
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=self.initargs)
+        # Start the workers now, so the first requests do not pay for it
+        for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def restart_pool(self, broken):
+        """Replaces a pool that broke, e.g. because a worker crashed; requests running in it fail with 500."""
+        with self.pool_lock:
+            if self.executor is not broken:
+                return
+            self.executor = self.start_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.count("restarts")
+
+    def solve(self, payload):
+        """
+        Solves a request in the pool and blocks until it is done.
+
+        Returns:
+            dict: The result of solve_request(), or None if the service is at capacity.
+
+        Raises:
+            InvalidScene: If the scene of the request cannot be loaded, counted as invalid.
+        """
+        if not self.slots.acquire(blocking=False):
+            self.count("rejected")
+            return None
+        start = time.perf_counter()
+        with self.lock:
+            self.pending += 1
+        executor = self.executor
+        try:
+            result = executor.submit(solve_request, payload).result()
+        except InvalidScene:
+            self.count("invalid")
+            raise
+        except Exception as error:
+            self.count("errors")
+            if isinstance(error, BrokenProcessPool):
+                self.restart_pool(executor)
+            raise
+        finally:
+            self.slots.release()
+            with self.lock:
+                self.pending -= 1
+
+        latency = time.perf_counter() - start
+        result["latency"] = latency
+        result["queue_time"] = max(latency - result["worker_time"], 0)
+        with self.lock:
+            self.counts["requests"] += 1
+            self.latencies.append(latency)
+            self.queue_times.append(result["queue_time"])
+        return result
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            queue_times = np.array(self.queue_times) * 1000
+            return {
+                "requests": self.counts["requests"],
+                "rejected": self.counts["rejected"],
+                "invalid": self.counts["invalid"],
+                "errors": self.counts["errors"],
+                "restarts": self.counts["restarts"],
+                "pending": self.pending,
+                "latency_ms": percentiles(latencies),
+                "queue_ms": percentiles(queue_times)
+            }
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+class LayoutHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def send_json(self, status, body, headers=()):
+        data = json.dumps(body, default=float).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self.send_json(200, self.service.stats())
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/layout":
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            validate_request(payload)
+        except ValueError as error:
+            self.service.count("invalid")
+            self.send_json(400, {"error": str(error)})
+            return
+
+        try:
+            result = self.service.solve(payload)
+        except InvalidScene as error:
+            self.send_json(400, {"error": str(error)})
+            return
+        except Exception as error:
+            self.send_json(500, {"error": repr(error)})
+            return
+        if result is None:
+            self.send_json(503, {"error": "Service at capacity"}, [("Retry-After", "1")])
+        else:
+            self.send_json(200, result)
+
+    def address_string(self):
+        # UNIX socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def scene_payload(path, **options):
+    """Reads a scene-N.json file and inlines its apps, so the service does not need access to the files."""
+    with open(path, "r") as file:
+        payload = json.load(file)
+    with open(payload["app_path"], "r") as file:
+        payload["apps"] = json.load(file)
+    payload.update(options)
+    return payload
+
+
+def request_layout(payload, host="127.0.0.1", port=8765, socket_path=None, timeout=60):
+    """
+    Client of the service, e.g. for UI.apply_layout(request_layout(scene_payload(path))["optimal_results"]).
+
+    Returns:
+        dict: The result of the service; raises RuntimeError with the error message otherwise.
+    """
+    connection = UnixHTTPConnection(socket_path, timeout) if socket_path else http.client.HTTPConnection(host, port, timeout)
+    try:
+        connection.request("POST", "/layout", json.dumps(payload, default=float), {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        body = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{response.status}: {body.get('error')}")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve UI layouts from a pool of warm optimizer workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Listen on a UNIX socket instead of TCP.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of worker processes.")
+    parser.add_argument("--threads", type=int, default=1, help="Gurobi threads per worker.")
+    parser.add_argument("--queue", type=int, default=16, help="Requests that may wait for a worker before 503.")
+    parser.add_argument("--grids", nargs="+", default=["8x6"], help="Grid sizes of the model templates.")
+    parser.add_argument("--apps", type=int, nargs="+", default=[6], help="Numbers of apps of the model templates.")
+    args = parser.parse_args()
+
+    from generate_scenes import parse_grid
+    templates = [parse_grid(grid) + (num_apps,) for grid in args.grids for num_apps in args.apps]
+    LayoutHandler.service = LayoutService(args.workers, args.threads, args.queue, templates)
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = UnixHTTPServer(args.socket, LayoutHandler)
+        address = args.socket
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), LayoutHandler)
+        address = f"http://{args.host}:{args.port}"
+    print(f"Serving layouts on {address} with {args.workers} workers", file=sys.stderr)
+    # Shut down cleanly on SIGTERM as well, e.g. to remove the socket file
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        LayoutHandler.service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import csv
+import hashlib
+import json
+import numpy as np
+
+# Structured binary study log. Besides its CSV file, UILogger can write the trials of a session as a NumPy structured
+# array (.npz) with a fixed, typed schema, so many sessions are merged without parsing the free-text summary rows.
+# The text fields are widened per file to the longest value, so questions, answers and scene ids are never truncated.
+# Running this module aggregates session files per scene and per layout:
+#
+#   python study_log.py logs/*.npz --csv aggregate.csv
+
+TRIAL_DTYPE = np.dtype([
+    ("qi", np.int32),
+    ("question", "U256"),
+    ("answer", "U64"),
+    ("user_answer", "U64"),
+    ("correct", np.bool_),
+    ("trial_time", np.float64),
+    ("scene_id", "U64"),
+    ("layout_hash", "U16")
+])
+
+# Text fields of TRIAL_DTYPE; their width there is the minimum, longer values widen the field
+TEXT_FIELDS = ("question", "answer", "user_answer", "scene_id")
+
+QUANTILES = [0.5, 0.9]
+
+
+def trial_dtype(widths):
+    """
+    Returns TRIAL_DTYPE with its text fields widened.
+
+    Args:
+        widths (dict[str, int]): Number of characters each text field must hold.
+    """
+    return np.dtype([(name, f"U{max(widths.get(name, 0), TRIAL_DTYPE[name].itemsize // 4)}") if name in TEXT_FIELDS
+                     else (name, TRIAL_DTYPE[name]) for name in TRIAL_DTYPE.names])
+
+
+def layout_hash(optimal_results):
+    """Returns a short hash identifying a layout, independent of the order of optimal_results."""
+    layout = sorted((result["name"], int(result["lod"]), [int(v) for v in result["placement"]]) for result in optimal_results)
+    return hashlib.sha256(json.dumps(layout).encode("utf-8")).hexdigest()[:16]
+
+
+def save_trials(path, trials, scene_id, layout, overlapping_poi=0, trial_layouts=None):
+    """
+    Writes the trials of one session to a compressed .npz file.
+
+    Args:
+        path (str): Output file.
+        trials (list of list): Rows [qi, question, answer, user_answer, correct, trial_time] as logged by UILogger.
+        scene_id (str): Scene the session was run on, e.g. the scene file.
+        layout (list of dict): optimal_results shown at the end of the session.
+        overlapping_poi (int): Number of apps overlapping the point of interest.
+        trial_layouts (list of list of dict): Layout on screen during each trial when it changed within the session,
+            e.g. by relayout.py; defaults to layout for every trial.
+    """
+    widths = {name: max((len(str(trial[i])) for trial in trials), default=0)
+              for i, name in ((1, "question"), (2, "answer"), (3, "user_answer"))}
+    widths["scene_id"] = len(str(scene_id))
+    if trial_layouts is None:
+        trial_layouts = [layout] * len(trials)
+    # Hash of every layout shown, so the layout of each layout_hash can be looked up
+    layouts = {layout_hash(shown): shown for shown in list(trial_layouts) + [layout]}
+    hashes = [layout_hash(shown) for shown in trial_layouts]
+    records = np.zeros(len(trials), dtype=trial_dtype(widths))
+    for i, (qi, question, answer, user_answer, correct, trial_time) in enumerate(trials):
+        records[i] = (qi, question, answer, user_answer, correct, trial_time, scene_id, hashes[i])
+    np.savez_compressed(path, trials=records, overlapping_poi=np.int32(overlapping_poi),
+                        layout=np.array(json.dumps(layout)), layouts=np.array(json.dumps(layouts)))
+
+
+def load_trials(paths):
+    """Loads and concatenates the trials of many session files, with the text fields as wide as the widest file."""
+    trials = []
+    for path in paths:
+        with np.load(path) as data:
+            trials.append(data["trials"])
+    widths = {name: max((t.dtype[name].itemsize // 4 for t in trials), default=0) for name in TEXT_FIELDS}
+    dtype = trial_dtype(widths)
+    return np.concatenate([t.astype(dtype) for t in trials]) if trials else np.zeros(0, dtype=dtype)
+
+
+def aggregate(trials, by=("scene_id",)):
+    """
+    Computes accuracy and trial time distributions per group.
+
+    Args:
+        trials (numpy.ndarray): Structured array with TRIAL_DTYPE.
+        by (tuple of str): Fields to group by, e.g. ("scene_id",) or ("scene_id", "layout_hash").
+
+    Returns:
+        numpy.ndarray: Structured array with one row per group: the group fields, trials, accuracy, mean trial time
+        and the QUANTILES of the trial time.
+    """
+    keys, group = np.unique(trials[list(by)], return_inverse=True)
+    group = group.reshape(-1)
+    counts = np.bincount(group, minlength=len(keys))
+    accuracy = np.bincount(group, weights=trials["correct"], minlength=len(keys)) / counts
+    mean_time = np.bincount(group, weights=trials["trial_time"], minlength=len(keys)) / counts
+
+    # Sort by group, then trial time, the quantiles are then read at offsets from the start of each group
+    order = np.lexsort((trials["trial_time"], group))
+    sorted_time = trials["trial_time"][order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    fields = [(name, keys.dtype[name]) for name in by]
+    fields += [("trials", np.int64), ("accuracy", np.float64), ("mean_time", np.float64)]
+    fields += [(f"p{int(q * 100)}_time", np.float64) for q in QUANTILES]
+    result = np.zeros(len(keys), dtype=fields)
+    for name in by:
+        result[name] = keys[name]
+    result["trials"] = counts
+    result["accuracy"] = accuracy
+    result["mean_time"] = mean_time
+    for q in QUANTILES:
+        position = starts + q * (counts - 1)
+        lower, upper = np.floor(position).astype(int), np.ceil(position).astype(int)
+        result[f"p{int(q * 100)}_time"] = sorted_time[lower] + (position - lower) * (sorted_time[upper] - sorted_time[lower])
+    return result
+
+
+def print_table(result):
+    names = result.dtype.names
+    print(" ".join(f"{name:>16}" for name in names))
+    for row in result:
+        print(" ".join(f"{value:>16.3f}" if isinstance(value, np.floating) else f"{str(value):>16}" for value in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate structured study logs per scene and per layout.")
+    parser.add_argument("logs", nargs="+", help="Session .npz files written by UILogger.")
+    parser.add_argument("--csv", help="Optional output CSV file with the per-layout aggregate.")
+    args = parser.parse_args()
+
+    trials = load_trials(args.logs)
+    print(f"Sessions: {len(args.logs)}, trials: {len(trials)}\n")
+    print("Per scene:")
+    print_table(aggregate(trials, ("scene_id",)))
+    per_layout = aggregate(trials, ("scene_id", "layout_hash"))
+    print("\nPer layout:")
+    print_table(per_layout)
+
+    if args.csv:
+        with open(args.csv, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(per_layout.dtype.names)
+            writer.writerows(per_layout.tolist())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import csv
+import itertools
+import random
+import sys
+import time
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from scene import Scene
+from objective import interaction_objective, placement_centers
+from placement_model import PlacementModel
+
+# Sweeps the objective weights of main.py: the interaction cost weight lambda, the LoD preference (1 + gamma * lod)
+# and a penalty mu per app that occludes the POI. One placement model is built and only its objective coefficients are
+# replaced between solves, Gurobi starts each solve from the previous solution. The layouts are reported with their
+# relevance, interaction cost and POI occlusion, Pareto-optimal ones are marked.
+#
+#   python sweep.py scenes/scene-1.json --lambdas 0 0.05 0.1 0.2 0.5 --gammas 0 0.5 1 2 --mus 0 0.5 1 2 5
+#   python sweep.py scenes/scene-1.json --hierarchical   # minimize the occlusion first, then the weighted objective
+
+
+def layout_metrics(placement, relevance, interaction_cost, occlusion):
+    """Returns the relevance, interaction cost and POI occlusion of the current solution of the model."""
+    chosen = placement.x.X > 0.5
+    return tuple(float(placement.candidate_values(metric)[chosen].sum()) for metric in (relevance, interaction_cost, occlusion))
+
+
+def pareto_mask(points):
+    """
+    Returns a boolean mask of the non-dominated points.
+
+    Args:
+        points (numpy.ndarray): Array of shape (n, k) with the objectives to minimize.
+    """
+    better_or_equal = (points[:, None, :] <= points[None, :, :]).all(axis=2)
+    strictly_better = (points[:, None, :] < points[None, :, :]).any(axis=2)
+    dominated = (better_or_equal & strictly_better).any(axis=0)
+    return ~dominated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve the placement ILP over a grid of objective weights.")
+    parser.add_argument("scene_path", nargs="?", default="scenes/scene-1.json")
+    parser.add_argument("--lambdas", type=float, nargs="+", default=[0, 0.05, 0.1, 0.2, 0.5], help="Interaction cost weights.")
+    parser.add_argument("--gammas", type=float, nargs="+", default=[0, 0.5, 1, 2], help="LoD weights (1 + gamma * lod).")
+    parser.add_argument("--mus", type=float, nargs="+", default=[0, 0.5, 1, 2, 5], help="POI occlusion penalties.")
+    parser.add_argument("--hierarchical", action="store_true",
+                        help="Minimize the POI occlusion first (Gurobi multi-objective), instead of the mu penalties.")
+    parser.add_argument("--rebuild", action="store_true", help="Build a new model for every point, for comparison.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random POI and questions panel positions.")
+    parser.add_argument("--csv", help="Optional output CSV file.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    try:
+        scene = Scene(args.scene_path)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Could not load the scene: {error}")
+    app_ids = list(scene.apps.keys())
+    info = scene.get_info()
+    lods = scene.LODS
+    env = gp.Env(params={"OutputFlag": 0})
+
+    # Per-placement metrics: relevance weighted by the LoD as in Version-2 and the squared distance to the questions
+    # panel as in Version-3
+    relevance = np.array([info["relevance"][app] for app in app_ids])[:, None, None, None] * (1 + np.arange(lods))[None, :, None, None]
+    xs, ys = placement_centers(info, lods)
+    question_x = info["questions_pos"][0] // info["block_size"] + 1
+    question_y = info["questions_pos"][1] // info["block_size"] + 1
+    interaction_cost = ((xs - question_x) ** 2 + (ys - question_y) ** 2)[None]
+
+    def build():
+        placement = PlacementModel(info, app_ids, lods, name="ui_sweep", env=env, prune_roi=False)
+        # Occluding the POI is penalized in the objective instead of being forbidden
+        placement.allow_roi()
+        return placement
+
+    mus = [0] if args.hierarchical else args.mus
+    points = list(itertools.product(args.lambdas, args.gammas, mus))
+    build_start = time.perf_counter()
+    placement = build()
+    occlusion = placement.roi[None].astype(float)
+    build_time = time.perf_counter() - build_start
+
+    rows = []
+    solve_start = time.perf_counter()
+    for i, (lambda_weight, gamma, mu) in enumerate(points):
+        coefficients = interaction_objective(info, app_ids, lods, lambda_weight, lod_weight=1 + gamma * np.arange(lods))
+        if args.rebuild and i > 0:
+            placement.model.dispose()
+            placement = build()
+        if args.hierarchical:
+            objectives = [-occlusion, coefficients]
+            if i == 0 or args.rebuild:
+                placement.set_objectives(zip(objectives, [1, 0]))
+            else:
+                placement.update_objectives(objectives)
+        else:
+            coefficients = coefficients - mu * occlusion
+            if i == 0 or args.rebuild:
+                placement.set_objective(coefficients, GRB.MAXIMIZE)
+            else:
+                placement.update_objective(coefficients)
+        placement.optimize()
+        rows.append((lambda_weight, gamma, mu) + layout_metrics(placement, relevance, interaction_cost, occlusion)
+                    + (placement.model.Runtime,))
+    sweep_time = time.perf_counter() - solve_start
+    placement.model.dispose()
+
+    table = np.array(rows)
+    pareto = pareto_mask(np.stack([-table[:, 3], table[:, 4], table[:, 5]], axis=1))
+    print(f"{'lambda':>7} {'gamma':>6} {'mu':>5} {'relevance':>10} {'interaction':>12} {'occlusion':>10} {'solve (ms)':>11} pareto")
+    for row, is_pareto in zip(rows, pareto):
+        print(f"{row[0]:>7.3f} {row[1]:>6.2f} {row[2]:>5.2f} {row[3]:>10.3f} {row[4]:>12.2f} {row[5]:>10.0f} "
+              f"{row[6] * 1000:>11.1f} {'*' if is_pareto else ''}")
+    distinct = len(np.unique(table[pareto, 3:6].round(9), axis=0))
+    print(f"\nPoints: {len(points)}, Pareto-optimal: {int(pareto.sum())} ({distinct} distinct trade-offs)")
+    print(f"Model build: {build_time * 1000:.1f} ms, sweep: {sweep_time * 1000:.1f} ms "
+          f"({'rebuild' if args.rebuild else 'reused model'})")
+
+    if args.csv:
+        with open(args.csv, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["lambda", "gamma", "mu", "relevance", "interaction_cost", "occlusion", "solve_time", "pareto"])
+            for row, is_pareto in zip(rows, pareto):
+                writer.writerow(list(row) + [bool(is_pareto)])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import sys 
-import json
 import numpy as np
 import tkinter as tk
 from tkinter import font
@@ -7,10 +6,16 @@ from PIL import Image, ImageTk, ImageDraw
 import csv
 from datetime import datetime
 import time
-import random
 import re
+import atexit
+import bisect
+import queue
+import threading
 
-from app import App
+from background_cache import cached_background, discard_background
+from geometry import circle_rectangle_overlap
+from scene import Scene
+from study_log import save_trials
 
 # Constants for delay. Do not change
 DELAY_LOD = 150
@@ -23,27 +28,118 @@ LOD_TEXT_SIZE = {0: 12, 1: 14, 2: 14}
 LOD_BG_COLOR = {0: "#F0FFF0", 1: "#DFFFD6", 2: "#90EE90"}
 
 class ListAppUI:
-    def __init__(self, parent, app):
+    # A row of the All Apps list. Rows are recycled while scrolling (see AllAppsList), so the app shown and the index
+    # of its info live in the list, not in the row.
+    def __init__(self, parent, app_list):
         self.parent = parent
-        self.app = app
-        self.i = 0 
-        self.label = tk.Label(self.parent, text=f"{self.app.name}: {self.app.info[self.i]}", height=5, anchor="w", justify="left", borderwidth=1, relief="solid")
-        self.label.pack(pady=5, padx=10, fill="x", expand=True)
+        self.app_list = app_list
+        self.app = None
+        self.label = tk.Label(self.parent, height=5, anchor="w", justify="left", borderwidth=1, relief="solid")
+        self.window = self.parent.create_window(0, 0, window=self.label, anchor="nw", state="hidden")
 
         #self.label.bind("<Button-1>", self.toggle_info)
         self.label.bind("<Button-1>", self.delayed_toggle_info)
 
+    def show(self, app, y, width):
+        self.app = app
+        self.label.config(text=f"{self.app.name}: {self.app.info[self.app_list.info_index[self.app.name]]}")
+        self.parent.coords(self.window, AllAppsList.PADX, y)
+        self.parent.itemconfigure(self.window, width=width, state="normal")
+
+    def hide(self):
+        self.app = None
+        self.parent.itemconfigure(self.window, state="hidden")
+
     def delayed_toggle_info(self, event):
-        self.label.unbind("<Button-1>") 
-        self.label.after(DELAY_ALL, self.toggle_info)
+        if self.app is not None:
+            self.app_list.delayed_toggle_info(self.app.name)
 
-    #def toggle_info(self, event):
-    def toggle_info(self):
-        self.i = (self.i + 1) % len(self.app.info)
-        self.label.config(text=f"{self.app.name}: {self.app.info[self.i]}")
 
-        # re-bind click
-        self.label.bind("<Button-1>", self.delayed_toggle_info)
+class AllAppsList:
+    """
+    Virtualized list of the apps in the All Apps panel, sorted by relevance (Optimal-4).
+
+    Only the rows in the visible part of the canvas have a ListAppUI label, the labels are recycled while scrolling.
+    A click toggles the info of an app after DELAY_ALL, further clicks on the app are ignored until then.
+    """
+    PADX, PADY = 10, 5
+    OVERSCAN = 2
+
+    def __init__(self, canvas, apps, relevance):
+        self.canvas = canvas
+        self.apps = apps
+        self.relevance = relevance
+        self.names = []
+        self.info_index = {name: 0 for name in apps}
+        self.pending = set()
+        self.rows = {}
+        self.pool = []
+        self.row_height = None
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __len__(self):
+        return len(self.names)
+
+    def set_apps(self, names):
+        self.names = sorted(names, key=lambda app: self.relevance.get(app, 0), reverse=True)
+        self.refresh()
+
+    def add(self, name):
+        # Keeps the relevance order of the apps, ties in the order of self.apps as in init_all_panel()
+        order = {app: i for i, app in enumerate(self.apps)}
+        self.set_apps(sorted(self.names + [name], key=order.get))
+
+    def remove(self, name):
+        self.names.remove(name)
+        self.refresh()
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def take_row(self):
+        row = self.pool.pop() if self.pool else ListAppUI(self.canvas, self)
+        if self.row_height is None:
+            self.row_height = row.label.winfo_reqheight() + 2 * self.PADY
+        return row
+
+    def refresh(self):
+        """Shows the rows in the visible part of the canvas and recycles the labels of the others."""
+        if self.row_height is None:
+            self.pool.append(self.take_row())
+        width = max(self.canvas.winfo_width() - 2 * self.PADX, 1)
+        self.canvas.configure(scrollregion=(0, 0, width + 2 * self.PADX, len(self.names) * self.row_height))
+        top = self.canvas.canvasy(0)
+        first = max(int(top // self.row_height) - self.OVERSCAN, 0)
+        last = min(int((top + self.canvas.winfo_height()) // self.row_height) + 1 + self.OVERSCAN, len(self.names))
+        visible = set(self.names[first:last])
+        for name in list(self.rows):
+            if name not in visible:
+                row = self.rows.pop(name)
+                row.hide()
+                self.pool.append(row)
+        for i in range(first, last):
+            name = self.names[i]
+            if name not in self.rows:
+                self.rows[name] = self.take_row()
+            self.rows[name].show(self.apps[name], i * self.row_height + self.PADY, width)
+
+    def delayed_toggle_info(self, name):
+        if name in self.pending:
+            return
+        self.pending.add(name)
+        self.canvas.after(DELAY_ALL, lambda: self.toggle_info(name))
+
+    #def toggle_info(self, event):
+    def toggle_info(self, name):
+        self.pending.discard(name)
+        self.info_index[name] = (self.info_index[name] + 1) % len(self.apps[name].info)
+        if name in self.rows:
+            self.rows[name].show(self.apps[name], self.canvas.coords(self.rows[name].window)[1],
+                                 max(self.canvas.winfo_width() - 2 * self.PADX, 1))
 
 class MainAppUI:
     def __init__(self, parent, app, lod, placement, ui):
@@ -82,6 +178,20 @@ class MainAppUI:
         self.label.bind("<Button-1>", self.delayed_update_lod)
 
 
+    def move(self, lod, placement):
+        # Re-grids the label at a new placement and LoD while the window is open, e.g. when the ROI moved
+        self.lod = lod
+        self.placement = placement
+        rowspan = 1 if lod < 2 else 2
+        colspan = 1 if lod < 1 else 2
+        wrap = (colspan * UI.BLOCK_SIZE) * 0.9
+        font_style = ("Arial", LOD_TEXT_SIZE.get(lod, 12), "normal")
+        self.label.config(text=f"{self.app.name}:\n{self.app.get_lod(self.lod)}",
+                          font=font_style,
+                          wraplength=wrap,
+                          bg=LOD_BG_COLOR.get(lod))
+        self.label.grid(column=self.placement[0], row=self.placement[1], rowspan=rowspan, columnspan=colspan, sticky="nsew")
+
     def delayed_update_lod(self, event):
         self.label.unbind("<Button-1>")
 
@@ -90,6 +200,9 @@ class MainAppUI:
 
 
     def update_lod(self):
+        # The app may have been removed from the layout by apply_layout() during the delay
+        if not self.label.winfo_exists():
+            return
         # Update LoD
         self.lod = (self.lod + 1) % len(self.app.info)
 
@@ -138,19 +251,76 @@ class MainAppUI:
 
 
 class UILogger:
-    def __init__(self):
+    # Rows are queued and written by a background thread that keeps the CSV file open, so slow disks do not stall
+    # the Tk main thread. The file is flushed every FLUSH_INTERVAL seconds, on log_summary() and at exit.
+    # With binary_log, the trials are also written to a typed .npz file for aggregation (see study_log.py).
+    FLUSH_INTERVAL = 1.0
+    QUEUE_SIZE = 1024
+
+    def __init__(self, binary_log=False, scene_id="", layout=()):
         self.start_time = time.time()
         self.trial_end = self.start_time
         timestamp = datetime.now().strftime("%d-%H-%M")
         self.filename = f"{timestamp}.csv"
+        self.binary_filename = f"{timestamp}.npz" if binary_log else None
+        self.scene_id = scene_id
+        self.layout = list(layout)
+        # Trials of the binary log, only collected with binary_log
+        self.trials = []
+        # (index of the first trial, layout) of every layout shown during the session
+        self.layouts = [(0, self.layout)]
+        self.overlapping_poi = 0
 
-        with open(self.filename, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(["QI", "Question", "Answer", "User Answer", "Correct?", "Trial Time (s)"])
+        self.file = open(self.filename, mode="w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["QI", "Question", "Answer", "User Answer", "Correct?", "Trial Time (s)"])
 
         self.total_trials = 0
         self.correct_answers = 0
 
+        self.rows = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.writer_thread = threading.Thread(target=self.write_rows, daemon=True)
+        self.writer_thread.start()
+        atexit.register(self.close)
+
+    def write_rows(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                row = self.rows.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                row = ()
+            if row is None:
+                break
+            if row:
+                self.writer.writerow(row)
+            if time.monotonic() - last_flush >= self.FLUSH_INTERVAL:
+                self.file.flush()
+                last_flush = time.monotonic()
+        self.file.close()
+
+    def close(self):
+        # Writes the queued rows and closes the file, safe to call more than once
+        if self.writer_thread.is_alive():
+            self.rows.put(None)
+            self.writer_thread.join()
+            if self.binary_filename is not None:
+                save_trials(self.binary_filename, self.trials, self.scene_id, self.layout, self.overlapping_poi,
+                            self.trial_layouts())
+
+    def set_layout(self, layout):
+        # Records the layout now on screen, e.g. after UI.apply_layout(); the following trials are logged with it
+        self.layout = list(layout)
+        if self.layouts[-1][0] == len(self.trials):
+            self.layouts[-1] = (len(self.trials), self.layout)
+        else:
+            self.layouts.append((len(self.trials), self.layout))
+
+    def trial_layouts(self):
+        # Layout on screen when each trial was logged
+        starts = [start for start, _ in self.layouts]
+        return [self.layouts[bisect.bisect_right(starts, i) - 1][1] for i in range(len(self.trials))]
+
     def log_answer(self, qi, question, answer, user_answer):
         # Please DO NOT modify the code below
 
@@ -168,10 +338,9 @@ class UILogger:
 
         self.total_trials += 1
 
-        with open(self.filename, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow([qi, question, answer, user_answer, is_correct, trial_time])
-            # writer.writerow([qi, question, answer, user_answer, elapsed_time])
+        self.rows.put([qi, question, answer, user_answer, is_correct, trial_time])
+        if self.binary_filename is not None:
+            self.trials.append([qi, question, answer, user_answer, is_correct, trial_time])
 
         print(f"Submit: QI={qi}, Question={question}, Answer={answer}, User Answer={user_answer}, Correct? {is_correct}, Trial Time={trial_time:.2f}s")
 
@@ -196,10 +365,10 @@ class UILogger:
         average_trial_time_penalty = average_trial_time + penalty + poi_penalty
         score = f"Average time per question + penalty: {average_trial_time_penalty:.2f}s"
 
-        with open(self.filename, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(["Summary", summary])
-            writer.writerow(["Final Score", score])
+        self.overlapping_poi = overlapping_poi
+        self.rows.put(["Summary", summary])
+        self.rows.put(["Final Score", score])
+        self.close()
 
         print("\nAll questions answered. ")
         print("\n======== SUMMARY ========")
@@ -207,51 +376,21 @@ class UILogger:
         print("\n=== FINAL SCORE ===")
         print(score)
 
-class UI:
-    LODS = 3
-    WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
-    BLOCK_SIZE = 100
-    COLS, ROWS = 8, 6
-    QUESTIONS_WIDTH, QUESTIONS_HEIGHT = 200, 200
-    BTN_ALL_POS = [10, 10]
-    BTN_ALL_WIDTH, BTN_ALL_HEIGHT = 80, 80
+class UI(Scene):
     ALL_WIDTH, ALL_HEIGHT = 700, 500
-    POI_RADIUS_MIN, POI_RADIUS_MAX = 50, 200
-    POI_PLACEMENT_PADDING = 100
 
-    def __init__(self, path="scene.json"):
-        self.load_scene(path)
+    def __init__(self, path="scene.json", scene=None, seed=None):
+        # Open a window for an already loaded (headless) scene, or load the scene from path (see Scene for the seed)
+        if scene is None:
+            self.load_scene(path, seed=seed)
+        else:
+            for name in Scene.__slots__:
+                setattr(self, name, getattr(scene, name))
         self.qi = 0 
         self.overlapping_poi = 0
         self.opening_all = False
 
-    # Retrieves key UI-related attributes used for layout, rendering, and optimization.
-    # Returns a dictionary containing:
-    # - "columns" (int): Number of columns in the UI grid.
-    # - "rows" (int): Number of rows in the UI grid.
-    # - "block_size" (int): Size of each block in the grid in pixels.
-    # - "questions_pos" (numpy.ndarray): X and Y position of the question panel in the UI in pixels.
-    # - "questions_size" (numpy.ndarray): Width and height of the question panel in pixels.
-    # - "btn_all_pos" (numpy.ndarray): Position of the "Apps" button to its top left corner in pixels.
-    # - "btn_all_size" (numpy.ndarray): Width and height of the "Apps" button in pixels.
-    # - "roi_pos" (numpy.ndarray): Position of the Region of Interest (ROI) in the UI in pixels.
-    # - "roi_rad" (int): Radius of the Region of Interest (ROI) in pixels.
-    # - "relevance" (dict[str, float]): A dictionary mapping application names to their relevance scores.
-    def get_info(self):
-        return {
-            "columns": self.COLS,
-            "rows": self.ROWS,
-            "block_size": self.BLOCK_SIZE, 
-            "questions_pos": self.q_pos,
-            "questions_size": np.array([self.QUESTIONS_WIDTH, self.QUESTIONS_HEIGHT]),
-            "btn_all_pos": self.BTN_ALL_POS,
-            "btn_all_size": np.array([self.BTN_ALL_WIDTH, self.BTN_ALL_HEIGHT]),
-            "roi_pos": self.poi_pos,
-            "roi_rad": self.poi_size, 
-            "relevance": self.relevance
-        }
-
-    def init_app(self, optimal_main=[], debug_poi=True):
+    def init_app(self, optimal_main=[], debug_poi=True, binary_log=False, on_start=None):
         # Initialize the user interface window
         self.root = tk.Tk()
         self.root.geometry(f"{UI.WINDOW_WIDTH}x{UI.WINDOW_HEIGHT}")
@@ -267,7 +406,6 @@ class UI:
         self.init_question()
 
         self.main_apps = {}
-        self.list_apps = {}
 
         # Initialize main applications 
         self.init_main_apps(optimal_main)
@@ -276,11 +414,16 @@ class UI:
         self.init_all_panel()
 
         # Logging the results
-        self.logging = UILogger()
+        self.logging = UILogger(binary_log, self.scene_path, optimal_main)
 
+        self.poi_ovals = []
         if debug_poi:
             self.debug_draw_poi()
 
+        # e.g. relayout.run_live(), which keeps updating the layout while the window is open
+        if on_start is not None:
+            on_start(self)
+
         self.root.mainloop()
 
     def init_grid(self):
@@ -290,6 +433,57 @@ class UI:
         for c in range(UI.COLS):
             self.root.grid_columnconfigure(c, weight=1, minsize=UI.BLOCK_SIZE)
 
+    def apply_layout(self, main_apps):
+        """
+        Updates the open window to a new layout in place by diffing it against self.main_apps.
+
+        Only main apps whose placement or LoD changed are re-gridded; apps that leave the layout move to the All Apps
+        panel, in relevance order, and apps that join it are taken out of it. Apps newly placed on the point of interest
+        add to the overlap count of the session and an open All Apps panel stays on top. The question session is not
+        touched.
+
+        Args:
+            main_apps (list of dict): The new layout, in the optimal_results format of init_app().
+
+        Returns:
+            dict: Names of the "added", "moved" and "removed" main apps.
+        """
+        placed = {main_app["name"]: main_app for main_app in main_apps if main_app["name"] in self.apps}
+        changes = {"added": [], "moved": [], "removed": []}
+        for name in list(self.main_apps):
+            if name not in placed:
+                self.main_apps.pop(name).label.destroy()
+                self.list_apps.add(name)
+                changes["removed"].append(name)
+        for name, main_app in placed.items():
+            lod, placement = main_app["lod"], list(main_app["placement"])
+            if name not in self.main_apps:
+                if name in self.list_apps:
+                    self.list_apps.remove(name)
+                self.main_apps[name] = MainAppUI(self.root, self.apps[name], lod, placement, self)
+                changes["added"].append(name)
+            elif (self.main_apps[name].lod, list(self.main_apps[name].placement)) != (lod, placement):
+                self.main_apps[name].move(lod, placement)
+                changes["moved"].append(name)
+
+        # Every app placed on the point of interest adds to the overlap count of the session; apps that stay where
+        # they are only count again when they start to overlap, e.g. after the point of interest moved
+        layout = [{"name": name, "lod": main_app.lod, "placement": list(main_app.placement)}
+                  for name, main_app in self.main_apps.items()]
+        is_overlap = self.ui_overlap(layout)
+        overlapping = {main_app["name"] for main_app, overlap in zip(layout, is_overlap) if overlap}
+        changed = set(changes["added"]) | set(changes["moved"])
+        self.overlapping_poi += len({name for name in overlapping if name in changed or name not in self.overlapping_apps})
+        self.overlapping_apps = overlapping
+        # The following trials are logged with this layout
+        self.logging.set_layout(layout)
+
+        # New labels are created on top, keep the "Apps" button and an open All Apps panel above them
+        self.btn_all.lift()
+        if self.frame_all.winfo_ismapped():
+            self.frame_all.lift()
+        return changes
+
     def init_main_apps(self, main_apps):
         for main_app in main_apps:
             name = main_app["name"]
@@ -297,7 +491,11 @@ class UI:
             placement = main_app["placement"]
             if name in self.apps:
                 self.main_apps[name] = MainAppUI(self.root, self.apps[name], lod, placement, self)
-                self.is_ui_overlap(name, placement, lod)
+        placed = [main_app for main_app in main_apps if main_app["name"] in self.apps]
+        is_overlap = self.ui_overlap(placed)
+        self.overlapping_poi += int(np.count_nonzero(is_overlap))
+        # Apps on the point of interest, apply_layout() only penalizes them again when they move or start to overlap
+        self.overlapping_apps = {main_app["name"] for main_app, overlap in zip(placed, is_overlap) if overlap}
 
     def open_all(self):
         if not self.frame_all.winfo_ismapped():
@@ -328,22 +526,17 @@ class UI:
         self.label_all = tk.Label(self.frame_all, text="All Applications")
         self.label_all.pack(pady=10)
 
-        # List Applications
+        # List Applications, only the visible rows get a label (see AllAppsList)
         self.canvas_all_list = tk.Canvas(self.frame_all)
-        self.frame_all_list = tk.Frame(self.canvas_all_list)
-        self.scrollbar = tk.Scrollbar(self.frame_all, orient="vertical", command=self.canvas_all_list.yview)
+        self.scrollbar = tk.Scrollbar(self.frame_all, orient="vertical")
         self.canvas_all_list.configure(yscrollcommand=self.scrollbar.set)
         self.scrollbar.pack(side="right", fill="y")
         self.canvas_all_list.pack(side="left", fill="both", expand=True)
-        self.canvas_all_list.create_window((0, 0), window=self.frame_all_list, anchor="nw")
-        def on_frame_configure(event):
-            self.canvas_all_list.configure(scrollregion=self.canvas_all_list.bbox("all"))
-        self.frame_all_list.bind("<Configure>", on_frame_configure)
+        self.list_apps = AllAppsList(self.canvas_all_list, self.apps, self.relevance)
+        self.scrollbar.configure(command=self.list_apps.yview)
         ''' Optimal-4: Sorts the remaining apps by relevance score '''
         remain_apps = [app for app in self.apps.keys() if app not in self.main_apps]
-        sort_apps = sorted(remain_apps, key=lambda app: self.relevance.get(app, 0), reverse=True)
-        for name in sort_apps:
-            self.list_apps[name] = ListAppUI(self.frame_all_list, self.apps[name])
+        self.list_apps.set_apps(remain_apps)
         # for name in self.apps:
         #     if name not in self.main_apps:
         #         self.list_apps[name] = ListAppUI(self.frame_all_list, self.apps[name])
@@ -354,9 +547,18 @@ class UI:
         self.btn_all.place(x=self.BTN_ALL_POS[0], y=self.BTN_ALL_POS[1], width=self.BTN_ALL_WIDTH, height=self.BTN_ALL_HEIGHT, anchor="nw") 
 
     def init_background(self):
-        img = Image.open(self.env_path)
-        img = img.resize((UI.WINDOW_WIDTH, UI.WINDOW_HEIGHT), Image.LANCZOS)
-        self.env_img = ImageTk.PhotoImage(img)
+        # Load the resized background from the on-disk cache, tkinter reads the PPM without PIL (see background_cache.py)
+        cache_path = None
+        try:
+            cache_path = cached_background(self.env_path, (UI.WINDOW_WIDTH, UI.WINDOW_HEIGHT))
+            self.env_img = tk.PhotoImage(file=cache_path)
+        except (OSError, tk.TclError):
+            # A cached image that tkinter cannot read is removed and written again on the next launch
+            if cache_path is not None:
+                discard_background(cache_path)
+            img = Image.open(self.env_path)
+            img = img.resize((UI.WINDOW_WIDTH, UI.WINDOW_HEIGHT), Image.LANCZOS)
+            self.env_img = ImageTk.PhotoImage(img)
         '''
         env_label = tk.Label(self.root, image=self.env_img)
         env_label.place(x=0, y=0, relwidth=1, relheight=1)
@@ -408,144 +610,71 @@ class UI:
         self.btn_submit.pack()
         self.frame_question.place(x=self.q_pos[0], y=self.q_pos[1], anchor="nw")
         
-    def load_scene(self, path="scene.json", shuffle_questions=True):
-        try:
-            with open(path, 'r') as file:
-                scene = json.load(file)
-            self.apps = self.load_apps(scene["app_path"])
-            self.env_path = scene["env_path"]
-            
-            if "poi_pos" in scene: 
-                self.poi_pos = np.array(scene["poi_pos"])
-            else: 
-                self.poi_pos = np.array([
-                    random.randint(self.POI_PLACEMENT_PADDING,self.WINDOW_WIDTH - self.POI_PLACEMENT_PADDING),
-                    random.randint(self.POI_PLACEMENT_PADDING,self.WINDOW_HEIGHT - self.POI_PLACEMENT_PADDING)
-                ])
-            if "poi_size" in scene:
-                self.poi_size = scene["poi_size"]
-            else: 
-                self.poi_size = random.randint(self.POI_RADIUS_MIN, self.POI_RADIUS_MAX)
-            
-            if "q_pos" in scene: 
-                self.q_pos = np.array(scene["q_pos"])
-            else: 
-                valid_placements = self.get_valid_question_placements()
-                self.q_pos = self.BLOCK_SIZE * np.array(valid_placements[
-                    random.randint(0, len(valid_placements) - 1)
-                ])
-                #self.q_pos = self.BLOCK_SIZE * np.array([
-                #    random.randint(0,self.COLS - 2),
-                #    random.randint(0,self.ROWS - 2)
-                #])
-                print(self.q_pos)
-            
-            self.init_relevance(scene["relevance"])
-            self.questions = self.load_questions(scene["questions"])
-            self.calculate_relevance()
-
-            if shuffle_questions:
-                random.shuffle(self.questions)
-        
-        except FileNotFoundError:
-            print(f"File not found: {path}")
-            sys.exit(1)
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from file: {path}")
-            sys.exit(1)
-
-    def load_questions(self, questions):
-        num_questions = len(questions)
-        for qi in range(num_questions):
-            app = self.apps[questions[qi]["app"]]
-            a = app.info[questions[qi]["lod"]]
-            questions[qi]["a"] = a
-        return questions
-        
-    def load_apps(self, path="apps.json"):
-        try:
-            apps = {}
-            with open(path, 'r') as file:
-                data = json.load(file)
-                for entry in data: 
-                    apps[entry["app"]] = App(entry["app"], entry["info"])
-            return apps
-        except FileNotFoundError:
-            print(f"File not found: {path}")
-            sys.exit(1)
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from file: {path}")
-            sys.exit(1)
-        
-    def init_relevance(self, relevance):
-        self.relevance = relevance
-        for app in self.apps.keys():
-            if app not in self.relevance:
-                self.relevance[app] = 0.0
-
-# Bonus-1: Automatically calculate relevance
-    def calculate_relevance(self):
-        """
-        Dynamically calculates relevance scores based on scene questions and apps.
-        Apps that appear in more questions get higher relevance scores.
-        """
-        question_counts = {app: 0 for app in self.apps.keys()}
-        for question in self.questions:
-            if question["app"] in question_counts:
-                question_counts[question["app"]] += 1
-        
-        max_count = max(question_counts.values(), default=1)
-        self.relevance = {app: count / max_count for app, count in question_counts.items()}
+    def poi_circles(self):
+        # (x0, y0, x1, y1) of every point of interest, scenes may have several
+        poi_pos = np.atleast_2d(self.poi_pos)
+        poi_size = np.broadcast_to(self.poi_size, len(poi_pos))
+        return [(x - radius, y - radius, x + radius, y + radius) for (x, y), radius in zip(poi_pos, poi_size)]
 
     def debug_draw_poi(self): 
-        x0 = self.poi_pos[0] - self.poi_size
-        y0 = self.poi_pos[1] - self.poi_size
-        x1 = self.poi_pos[0] + self.poi_size
-        y1 = self.poi_pos[1] + self.poi_size
-        self.env_canvas.create_oval(x0, y0, x1, y1, outline="red", width=5)
+        self.poi_ovals = [self.env_canvas.create_oval(*circle, outline="red", width=5) for circle in self.poi_circles()]
 
-    def circle_rectangle_overlap(self, circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height):
-        # Find the closest point on the rectangle to the circle's center
-        closest_x = max(rect_x, min(circle_x, rect_x + rect_width))
-        closest_y = max(rect_y, min(circle_y, rect_y + rect_height))
+    def update_poi(self, poi_pos, poi_size):
+        """
+        Moves the points of interest, e.g. when they follow the gaze of the user.
 
-        # Calculate the distance between the circle's center and the closest point
-        distance_x = circle_x - closest_x
-        distance_y = circle_y - closest_y
-        distance_squared = distance_x**2 + distance_y**2
+        Args:
+            poi_pos (numpy.ndarray): Position (2,) of a single POI or positions (n, 2) of n POIs in pixels.
+            poi_size (int or numpy.ndarray): Radius or radii (n,) in pixels.
+        """
+        self.poi_pos, self.poi_size = np.asarray(poi_pos), poi_size
+        if not self.poi_ovals:
+            return
+        circles = self.poi_circles()
+        if len(circles) != len(self.poi_ovals):
+            for oval in self.poi_ovals:
+                self.env_canvas.delete(oval)
+            self.debug_draw_poi()
+            return
+        for oval, circle in zip(self.poi_ovals, circles):
+            self.env_canvas.coords(oval, *circle)
 
-        # Check if the distance is less than or equal to the circle's radius
-        return distance_squared <= circle_radius**2
+    def circle_rectangle_overlap(self, circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height):
+        # Boolean version of geometry.circle_rectangle_overlap, True if any of the circles overlaps the rectangle
+        return bool(np.any(circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height)))
+
+    def count_ui_overlap(self, main_apps):
+        # Counts the placed apps overlapping the point of interest
+        self.overlapping_poi += int(np.count_nonzero(self.ui_overlap(main_apps)))
+
+    def ui_overlap(self, main_apps):
+        # Checks which placed apps overlap the point of interest with one vectorized check
+        if not main_apps:
+            return np.zeros(0, dtype=bool)
+        placements = np.array([main_app["placement"] for main_app in main_apps])
+        lods = np.array([main_app["lod"] for main_app in main_apps])
+        rect_width = np.where(lods > 0, 2, 1) * self.BLOCK_SIZE
+        rect_height = np.where(lods > 1, 2, 1) * self.BLOCK_SIZE
+        poi_pos = np.atleast_2d(self.poi_pos)
+        poi_size = np.broadcast_to(self.poi_size, len(poi_pos))
+        is_overlap = circle_rectangle_overlap(poi_pos[:, 0, None], poi_pos[:, 1, None], poi_size[:, None],
+                                              placements[:, 0] * self.BLOCK_SIZE, placements[:, 1] * self.BLOCK_SIZE,
+                                              rect_width, rect_height).any(axis=0)
+        return is_overlap
+        #print([main_app["name"] for main_app in main_apps], "overlapping poi:", is_overlap)
 
     def is_ui_overlap(self, name, placement, lod):
-        circle_x, circle_y, circle_radius = self.poi_pos[0], self.poi_pos[1], self.poi_size
-        rect_x, rect_y = placement[0] * self.BLOCK_SIZE, placement[1] * self.BLOCK_SIZE
-        rect_width, rect_height = self.BLOCK_SIZE, self.BLOCK_SIZE
-        if lod > 0:
-            rect_width = 2 * self.BLOCK_SIZE
-        if lod > 1: 
-            rect_height = 2 * self.BLOCK_SIZE
-        is_overlap = self.circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height)
-        if is_overlap:
-            self.overlapping_poi += 1
-        #print(name, "overlapping poi:", is_overlap)
+        self.count_ui_overlap([{"name": name, "lod": lod, "placement": placement}])
 
     def is_question_overlap(self, placement):
         # Check if the question panel overlaps with the "All Apps" button at position [0,0]
         if placement == [0, 0]:
             return True
 
-        # Check if the question panel overlaps with the point of interest
-        circle_x, circle_y, circle_radius = self.poi_pos[0], self.poi_pos[1], self.poi_size
+        # Check if the question panel overlaps with the points of interest
+        poi_pos = np.atleast_2d(self.poi_pos)
+        circle_x, circle_y, circle_radius = poi_pos[:, 0], poi_pos[:, 1], self.poi_size
         rect_x, rect_y = placement[0] * self.BLOCK_SIZE, placement[1] * self.BLOCK_SIZE
         rect_width = 2 * self.BLOCK_SIZE
         rect_height = 2 * self.BLOCK_SIZE
-        return self.circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height)
-
-    def get_valid_question_placements(self):
-        valid_pos = []
-        for xIdx in range(self.COLS - 2):
-            for yIdx in range(self.ROWS - 2):
-                if not self.is_question_overlap([xIdx, yIdx]):
-                    valid_pos.append([xIdx, yIdx])
-        return valid_pos
\ No newline at end of file
+        return self.circle_rectangle_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height)
\ No newline at end of file